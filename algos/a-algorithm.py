@@ -1,4 +1,8 @@
 import math
+import heapq
+import re
+from array import array
+from collections import deque
 from queue import PriorityQueue
 
 WIDTH = 800
@@ -98,43 +102,732 @@ def reconstruct_path(came_from, current, draw):
     return path
 
 
-def algorithm(draw, grid, start, end):
+# --- Paredes en bitset (1 bit por celda) para mapas grandes en el servidor web ---
+
+
+class GridBits:
+    """Paredes de una grilla n x n: bit i%8 del byte i//8 vale 1 si la celda i es pared."""
+
+    _UNPACK = [bytes((b >> k) & 1 for k in range(8)) for b in range(256)]
+
+    def __init__(self, n, bits=None):
+        self.n = n
+        self.bits = bytearray(bits) if bits is not None else bytearray((n * n + 7) // 8)
+
+    def __len__(self):
+        return self.n * self.n
+
+    def __getitem__(self, i):
+        return (self.bits[i >> 3] >> (i & 7)) & 1
+
+    def __setitem__(self, i, v):
+        if v:
+            self.bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self.bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def unpack(self):
+        """bytearray de n*n con 1 = pared, el formato que esperan los motores."""
+        table = self._UNPACK
+        data = bytearray(b"".join([table[b] for b in self.bits]))
+        del data[len(self):]
+        return data
+
+    def rle(self, max_runs=None):
+        """Longitudes de rachas alternas empezando por celdas libres (la primera puede ser 0).
+        Devuelve None si hay más de max_runs rachas (p. ej. paredes aleatorias)."""
+        data = self.unpack()
+        runs = [0] if data and data[0] else []
+        for m in re.finditer(rb"\x00+|\x01+", data):
+            runs.append(m.end() - m.start())
+            if max_runs is not None and len(runs) > max_runs:
+                return None
+        return runs
+
+
+# --- Motor compacto sobre buffers planos (compartido por escritorio y web) ---
+# La grilla n x n se indexa como i = fila*n + col. Paredes en un bytearray (1 = pared),
+# g en float32, padres en int32 y el estado de cada celda (0 nueva, 1 abierta,
+# 2 cerrada) en otro bytearray: ~10 bytes por celda, sin objetos por casilla.
+INF = float("inf")
+SQRT2 = math.sqrt(2.0)
+
+# Heurísticas sobre (|dfila|, |dcol|). manhattan es admisible en 4-conexo;
+# octile/euclidean/chebyshev lo son en 8-conexo (diagonal = sqrt(2)).
+HEURISTICS = {
+    "manhattan": lambda dr, dc: dr + dc,
+    "octile": lambda dr, dc: max(dr, dc) + (SQRT2 - 1.0) * min(dr, dc),
+    "euclidean": lambda dr, dc: math.hypot(dr, dc),
+    "chebyshev": lambda dr, dc: max(dr, dc),
+    "zero": lambda dr, dc: 0,
+}
+DEFAULT_HEURISTIC = {4: "manhattan", 8: "octile"}
+
+
+def grid_neighbors(i, n, walls, connectivity=4):
+    """Vecinos (v, coste) de i. En 8-conexo no se cortan esquinas: una diagonal
+    exige que las dos casillas ortogonales que rodea estén libres."""
+    r, c = divmod(i, n)
+    down = r + 1 < n and not walls[i + n]
+    up = r > 0 and not walls[i - n]
+    right = c + 1 < n and not walls[i + 1]
+    left = c > 0 and not walls[i - 1]
+    if down:
+        yield i + n, 1.0
+    if up:
+        yield i - n, 1.0
+    if right:
+        yield i + 1, 1.0
+    if left:
+        yield i - 1, 1.0
+    if connectivity == 8:
+        if down and right and not walls[i + n + 1]:
+            yield i + n + 1, SQRT2
+        if down and left and not walls[i + n - 1]:
+            yield i + n - 1, SQRT2
+        if up and right and not walls[i - n + 1]:
+            yield i - n + 1, SQRT2
+        if up and left and not walls[i - n - 1]:
+            yield i - n - 1, SQRT2
+
+
+def astar_grid(n, walls, start, end, on_close=None, on_parent=None,
+               connectivity=4, heuristic=None, weight=1.0, tie="fifo"):
+    """A* sobre una grilla plana.
+
+    walls: secuencia de n*n bytes (bytearray/bytes/list) con 1 = pared.
+    on_close(u, g, f, parent): se llama al sacar u del heap (antes de expandirlo).
+    on_parent(v, u, new): se llama al mejorar el padre de v; new=True si v entra al open set.
+    connectivity: 4 u 8 (diagonales de coste sqrt(2) sin cortar esquinas).
+    heuristic: clave de HEURISTICS (por defecto la admisible del movimiento).
+    weight: A* ponderado, f = g + weight*h; el coste queda acotado por weight*óptimo.
+    tie: "fifo" desempata por orden de inserción; "g" prefiere el mayor g (más profundo).
+    Devuelve (camino como lista de índices desde start hasta end, nodos expandidos).
+    """
+    total = n * n
+    walls = walls if isinstance(walls, (bytes, bytearray)) else bytearray(walls)
+    if walls[start] or walls[end]:
+        return [], 0
+    er, ec = divmod(end, n)
+    hfun = HEURISTICS[heuristic or DEFAULT_HEURISTIC[connectivity]]
+    deep = tie == "g"
+
+    def hw(i):
+        return weight * hfun(abs(i // n - er), abs(i % n - ec))
+
+    g = array("f", [INF]) * total
+    parent = array("i", [-1]) * total
+    state = bytearray(total)
+
+    g[start] = 0.0
+    heap = [(hw(start), 0.0, 0, start)]
+    state[start] = 1
+    count = 0
+    expanded = 0
+
+    while heap:
+        _, _, _, u = heapq.heappop(heap)
+        if state[u] != 1:
+            continue
+        state[u] = 2
+        expanded += 1
+        gu = g[u]
+        if on_close:
+            on_close(u, gu, gu + hw(u), parent[u])
+
+        if u == end:
+            path = [u]
+            while parent[path[-1]] != -1:
+                path.append(parent[path[-1]])
+            path.reverse()
+            return path, expanded
+
+        for v, cost in grid_neighbors(u, n, walls, connectivity):
+            if state[v] == 2:
+                continue  # sin reabrir cerrados (con weight > 1 la cota sigue valiendo)
+            cand = gu + cost
+            if cand < g[v]:
+                parent[v] = u
+                g[v] = cand
+                new = state[v] == 0
+                if on_parent:
+                    on_parent(v, u, new)
+                # también si v ya estaba abierto: su clave bajó (la entrada vieja se descarta al salir)
+                count += 1
+                state[v] = 1
+                heapq.heappush(heap, (cand + hw(v), -cand if deep else 0.0, count, v))
+
+    return [], expanded
+
+
+def path_cost(path, n):
+    """Coste de un camino de índices (1 ortogonal, sqrt(2) diagonal)."""
+    cost = 0.0
+    for u, v in zip(path, path[1:]):
+        cost += SQRT2 if abs(u - v) not in (1, n) else 1.0
+    return cost
+
+
+# --- Jump Point Search (grillas de coste uniforme) ---
+# Misma interfaz que astar_grid, pero solo se expanden los puntos de salto: las
+# rectas/diagonales sin vecinos forzados se recorren sin tocar el heap. Las reglas
+# de poda siguen las variantes "sin diagonales" y "diagonal sin cortar esquinas"
+# de Harabor & Grastien, coherentes con grid_neighbors. Los saltos son iterativos
+# (nada de recursión) para soportar pasillos largos.
+
+
+def _jps_free(walls, n, r, c):
+    return 0 <= r < n and 0 <= c < n and not walls[r * n + c]
+
+
+def _jps_jump_straight(walls, n, r, c, dr, dc, end, connectivity):
+    """Avanza desde (r, c) en línea recta hasta un punto de salto o una pared."""
+    free = _jps_free
+    while True:
+        r += dr
+        c += dc
+        if not free(walls, n, r, c):
+            return -1
+        i = r * n + c
+        if i == end:
+            return i
+        if dc:
+            if (free(walls, n, r - 1, c) and not free(walls, n, r - 1, c - dc)) or \
+               (free(walls, n, r + 1, c) and not free(walls, n, r + 1, c - dc)):
+                return i
+        else:
+            if (free(walls, n, r, c - 1) and not free(walls, n, r - dr, c - 1)) or \
+               (free(walls, n, r, c + 1) and not free(walls, n, r - dr, c + 1)):
+                return i
+            # en 4-conexo un movimiento vertical también salta si hay un punto de salto lateral
+            if connectivity == 4 and (
+                    _jps_jump_straight(walls, n, r, c, 0, 1, end, 4) != -1 or
+                    _jps_jump_straight(walls, n, r, c, 0, -1, end, 4) != -1):
+                return i
+
+
+def _jps_jump(walls, n, r, c, dr, dc, end, connectivity):
+    if not (dr and dc):
+        return _jps_jump_straight(walls, n, r - dr, c - dc, dr, dc, end, connectivity)
+    free = _jps_free
+    while True:
+        if not free(walls, n, r, c):
+            return -1
+        i = r * n + c
+        if i == end:
+            return i
+        if _jps_jump_straight(walls, n, r, c, 0, dc, end, 8) != -1 or \
+           _jps_jump_straight(walls, n, r, c, dr, 0, end, 8) != -1:
+            return i
+        if not (free(walls, n, r, c + dc) and free(walls, n, r + dr, c)):
+            return -1
+        r += dr
+        c += dc
+
+
+def _jps_directions(walls, n, u, p, connectivity):
+    """Direcciones (dr, dc) a explorar desde u llegando desde p (p = -1 en el origen)."""
+    free = _jps_free
+    r, c = divmod(u, n)
+    if p == -1:
+        dirs = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        if connectivity == 8:
+            dirs += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+        return [(dr, dc) for dr, dc in dirs
+                if free(walls, n, r + dr, c + dc) and
+                (not (dr and dc) or (free(walls, n, r + dr, c) and free(walls, n, r, c + dc)))]
+    pr, pc = divmod(p, n)
+    dr, dc = (r > pr) - (r < pr), (c > pc) - (c < pc)
+    out = []
+    if dr and dc:
+        if free(walls, n, r + dr, c):
+            out.append((dr, 0))
+        if free(walls, n, r, c + dc):
+            out.append((0, dc))
+        if free(walls, n, r + dr, c) and free(walls, n, r, c + dc):
+            out.append((dr, dc))
+        return out
+    # recto: seguir, girar a los lados y (en 8-conexo) las diagonales hacia delante
+    side = [(1, 0), (-1, 0)] if dc else [(0, 1), (0, -1)]
+    ahead = free(walls, n, r + dr, c + dc)
+    if ahead:
+        out.append((dr, dc))
+    for sr, sc in side:
+        if free(walls, n, r + sr, c + sc):
+            out.append((sr, sc))
+            if connectivity == 8 and ahead and free(walls, n, r + dr + sr, c + dc + sc):
+                out.append((dr + sr, dc + sc))
+    return out
+
+
+def jps_grid(n, walls, start, end, on_close=None, on_parent=None,
+             connectivity=4, heuristic=None, weight=1.0, tie="fifo"):
+    """Jump Point Search con la misma firma y resultado que astar_grid.
+
+    Los callbacks reciben solo puntos de salto; el camino devuelto se rellena
+    celda a celda y tiene el mismo coste óptimo que el de astar_grid.
+    """
+    walls = walls if isinstance(walls, (bytes, bytearray)) else bytearray(walls)
+    if walls[start] or walls[end]:
+        return [], 0
+    er, ec = divmod(end, n)
+    hfun = HEURISTICS[heuristic or DEFAULT_HEURISTIC[connectivity]]
+    deep = tie == "g"
+
+    def hw(i):
+        return weight * hfun(abs(i // n - er), abs(i % n - ec))
+
+    g = {start: 0.0}
+    parent = {start: -1}
+    closed = set()
+    heap = [(hw(start), 0.0, 0, start)]
+    count = 0
+    expanded = 0
+
+    while heap:
+        _, _, _, u = heapq.heappop(heap)
+        if u in closed:
+            continue
+        closed.add(u)
+        expanded += 1
+        gu = g[u]
+        if on_close:
+            on_close(u, gu, gu + hw(u), parent[u])
+
+        if u == end:
+            jumps = [u]
+            while parent[jumps[-1]] != -1:
+                jumps.append(parent[jumps[-1]])
+            jumps.reverse()
+            path = [start]
+            for a, b in zip(jumps, jumps[1:]):
+                (ar, ac), (br, bc) = divmod(a, n), divmod(b, n)
+                sr, sc = (br > ar) - (br < ar), (bc > ac) - (bc < ac)
+                while (ar, ac) != (br, bc):
+                    ar += sr
+                    ac += sc
+                    path.append(ar * n + ac)
+            return path, expanded
+
+        ur, uc = divmod(u, n)
+        for dr, dc in _jps_directions(walls, n, u, parent[u], connectivity):
+            v = _jps_jump(walls, n, ur + dr, uc + dc, dr, dc, end, connectivity)
+            if v == -1 or v in closed:
+                continue
+            vr, vc = divmod(v, n)
+            a, b = abs(vr - ur), abs(vc - uc)
+            cand = gu + (max(a, b) + (SQRT2 - 1.0) * min(a, b) if dr and dc else a + b)
+            if cand < g.get(v, INF):
+                new = v not in g
+                g[v] = cand
+                parent[v] = u
+                if on_parent:
+                    on_parent(v, u, new)
+                count += 1
+                heapq.heappush(heap, (cand + hw(v), -cand if deep else 0.0, count, v))
+
+    return [], expanded
+
+
+# --- A* bidireccional ---
+# Dos búsquedas (origen -> meta y meta -> origen) con el potencial promedio
+# p(v) = (h_meta(v) - h_origen(v)) / 2: delante la clave es g + p y detrás g - p.
+# Equivale a un Dijkstra bidireccional sobre costes reducidos, así que se puede
+# parar en cuanto la suma de las claves mínimas alcanza mu, el mejor camino que
+# une ambos árboles (Goldberg & Harrelson, "consistent approach").
+
+
+def bidirectional_grid(n, walls, start, end, on_close=None, on_parent=None,
+                       connectivity=4, heuristic=None, weight=1.0, tie="fifo"):
+    """A* bidireccional con la misma firma y resultado que astar_grid.
+
+    Los callbacks cubren ambos árboles: cada celda se atribuye al primer lado que
+    la alcanza, de modo que su padre apunta hacia el origen o hacia la meta y un
+    camino parcial termina en una de las dos raíces.
+    """
+    total = n * n
+    walls = walls if isinstance(walls, (bytes, bytearray)) else bytearray(walls)
+    if walls[start] or walls[end]:
+        return [], 0
+    hfun = HEURISTICS[heuristic or DEFAULT_HEURISTIC[connectivity]]
+    deep = tie == "g"
+    (sr, sc), (er, ec) = divmod(start, n), divmod(end, n)
+
+    def h_end(i):
+        return weight * hfun(abs(i // n - er), abs(i % n - ec))
+
+    def h_start(i):
+        return weight * hfun(abs(i // n - sr), abs(i % n - sc))
+
+    def pot(i):
+        return 0.5 * (h_end(i) - h_start(i))
+
+    # índice 0 = hacia delante (desde start), 1 = hacia atrás (desde end)
+    signs = (1.0, -1.0)
+    hs = (h_end, h_start)
+    gs = (array("d", [INF]) * total, array("d", [INF]) * total)
+    parents = (array("i", [-1]) * total, array("i", [-1]) * total)
+    closed = (bytearray(total), bytearray(total))
+    heaps = ([(pot(start), 0.0, 0, start)], [(-pot(end), 0.0, 0, end)])
+    gs[0][start] = 0.0
+    gs[1][end] = 0.0
+    owner = bytearray(total)  # 0 = nadie, 1 = delante, 2 = atrás (solo para los callbacks)
+    owner[start], owner[end] = 1, 2
     count = 0
-    open_set = PriorityQueue()
-    open_set.put((0, count, start))
-    came_from = {}
-    g_score = {spot: float("inf") for row in grid for spot in row}
-    g_score[start] = 0
-    f_score = {spot: float("inf") for row in grid for spot in row}
-    f_score[start] = h(start.get_pos(), end.get_pos())
-
-    open_set_hash = {start}
-
-    while not open_set.empty():
-        current = open_set.get()[2]
-        open_set_hash.remove(current)
-
-        if current == end:
-            path = reconstruct_path(came_from, end, draw)
-            end.make_end()
-            return True, path
-
-        for neighbor in current.neighbors:
-            temp_g_score = g_score[current] + 1
-            if temp_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = temp_g_score
-                f_score[neighbor] = temp_g_score + h(neighbor.get_pos(), end.get_pos())
-                if neighbor not in open_set_hash:
-                    count += 1
-                    open_set.put((f_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    neighbor.make_open()
-
-        if current != start:
-            current.make_closed()
-
-    return False, []
+    expanded = 0
+    per_side = [0, 0]
+    mu, meet = INF, None
+
+    def top(side):
+        heap = heaps[side]
+        while heap and closed[side][heap[0][3]]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else INF
+
+    while True:
+        kf, kb = top(0), top(1)
+        if kf == INF or kb == INF or kf + kb >= mu:
+            break
+        # con claves iguales (mesetas) se alterna hacia el lado con menos expansiones
+        side = 0 if (kf, per_side[0]) <= (kb, per_side[1]) else 1
+        g, parent, done, other = gs[side], parents[side], closed[side], gs[1 - side]
+        sign = signs[side]
+        _, _, _, u = heapq.heappop(heaps[side])
+        done[u] = 1
+        expanded += 1
+        per_side[side] += 1
+        gu = g[u]
+        if on_close and owner[u] == side + 1:
+            on_close(u, gu, gu + hs[side](u), parent[u])
+
+        for v, cost in grid_neighbors(u, n, walls, connectivity):
+            if done[v]:
+                continue
+            cand = gu + cost
+            if cand < g[v]:
+                g[v] = cand
+                parent[v] = u
+                if on_parent and owner[v] in (0, side + 1):
+                    on_parent(v, u, owner[v] == 0)
+                    owner[v] = side + 1
+                count += 1
+                heapq.heappush(heaps[side], (cand + sign * pot(v), -cand if deep else 0.0, count, v))
+            if g[v] + other[v] < mu:
+                mu = g[v] + other[v]
+                meet = v
+
+    if meet is None:
+        return [], expanded
+    path = [meet]
+    while parents[0][path[-1]] != -1:
+        path.append(parents[0][path[-1]])
+    path.reverse()
+    while parents[1][path[-1]] != -1:
+        path.append(parents[1][path[-1]])
+    return path, expanded
+
+
+# --- Componentes conexas de las celdas libres (alcanzabilidad en O(1)) ---
+
+
+class GridComponents:
+    """
+    Etiqueta de componente de cada celda libre, mantenida ante ediciones de paredes.
+    Sin cortar esquinas, 8-conexo tiene las mismas componentes que 4-conexo.
+
+    Quitar una pared une las etiquetas vecinas (union-find sobre etiquetas). Poner una
+    puede partir la componente: si el anillo de 8 vecinos no lo descarta, la raíz queda
+    "sucia" y se reetiqueta en la siguiente consulta que la necesite. Las celdas sin
+    etiqueta (0) también se etiquetan bajo demanda; una raíz "abierta" quizá toca alguna.
+    """
+
+    def __init__(self, n, walls):
+        self.n = n
+        self.walls = bytearray(walls)
+        self.label = array("i", bytes(4 * n * n))  # 0 = sin etiqueta
+        self.parent = [0]     # union-find de etiquetas (la 0 no se usa)
+        self.dirty = set()    # raíces cuyas celdas quizá ya no son conexas
+        self.open = set()     # raíces que quizá lindan con celdas sin etiqueta
+
+    def _find(self, a):
+        p = self.parent
+        r = a
+        while p[r] != r:
+            r = p[r]
+        while p[a] != r:
+            p[a], a = r, p[a]
+        return r
+
+    def _root(self, i):
+        lab = self.label[i]
+        return self._find(lab) if lab else 0
+
+    def _union(self, a, b):
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return ra
+        self.parent[rb] = ra
+        for marks in (self.dirty, self.open):
+            if rb in marks:
+                marks.discard(rb)
+                marks.add(ra)
+        return ra
+
+    def _new_label(self, cells):
+        lab = len(self.parent)
+        self.parent.append(lab)
+        for c in cells:
+            self.label[c] = lab
+        return lab
+
+    def _may_split(self, i):
+        """True si los vecinos ortogonales libres de i no siguen unidos por el anillo 3x3."""
+        n, w = self.n, self.walls
+        r, c = divmod(i, n)
+        ring = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+        free = [0 <= r + dr < n and 0 <= c + dc < n and not w[(r + dr) * n + c + dc] for dr, dc in ring]
+        if all(free):
+            return False
+        k0 = free.index(False)
+        groups, inside, orth = 0, False, False
+        for j in range(1, 9):
+            k = (k0 + j) % 8
+            if free[k]:
+                if not inside:
+                    inside, orth = True, False
+                orth = orth or k % 2 == 0  # posiciones pares = ortogonales
+            elif inside:
+                inside = False
+                groups += orth
+        return groups > 1
+
+    def set_cell(self, i, wall):
+        """Aplica el cambio de la celda i (1 = pared) a las etiquetas."""
+        wall = 1 if wall else 0
+        if self.walls[i] == wall:
+            return
+        self.walls[i] = wall
+        if wall:
+            lab = self.label[i]
+            self.label[i] = 0
+            if lab and self._may_split(i):
+                self.dirty.add(self._find(lab))
+            return
+        labs = [self.label[v] for v, _ in grid_neighbors(i, self.n, self.walls)]
+        if not labs:
+            self._new_label((i,))
+        elif 0 in labs:
+            for lab in labs:
+                if lab:
+                    self.open.add(self._find(lab))
+        else:
+            root = labs[0]
+            for lab in labs[1:]:
+                root = self._union(root, lab)
+            self.label[i] = root
+
+    def connected(self, s, t):
+        """¿Hay camino libre entre s y t? O(1) salvo que haya que (re)etiquetar."""
+        if self.walls[s] or self.walls[t]:
+            return False
+        if s == t:
+            return True
+        a, b = self._root(s), self._root(t)
+        if a and a == b and a not in self.dirty:
+            return True
+        # una raíz cerrada contiene toda la componente de sus celdas
+        if a != b and ((a and a not in self.open) or (b and b not in self.open)):
+            return False
+        return self._explore(s, t)
+
+    def _explore(self, s, t):
+        """BFS desde ambos extremos avanzando el lado más chico; la parte explorada
+        que resulta ser una componente completa recibe etiqueta nueva."""
+        n, w = self.n, self.walls
+        side = {s: 0, t: 1}
+        queues = (deque([s]), deque([t]))
+        sizes = [1, 1]
+        while queues[0] and queues[1]:
+            k = 0 if sizes[0] <= sizes[1] else 1
+            u = queues[k].popleft()
+            for v, _ in grid_neighbors(u, n, w):
+                other = side.get(v)
+                if other is None:
+                    side[v] = k
+                    sizes[k] += 1
+                    queues[k].append(v)
+                elif other != k:
+                    # se encontraron: se completa la componente para que las próximas consultas sean O(1)
+                    queue = queues[0] + queues[1]
+                    queue.append(u)  # u quedó a medio expandir
+                    while queue:
+                        u = queue.popleft()
+                        for x, _ in grid_neighbors(u, n, w):
+                            if x not in side:
+                                side[x] = k
+                                queue.append(x)
+                    self._new_label(side)
+                    return True
+        k = 0 if not queues[0] else 1
+        self._new_label([c for c, sd in side.items() if sd == k])
+        return False
+
+
+# --- LPA* (Lifelong Planning A*, Koenig & Likhachev) ---
+# Conserva g/rhs entre llamadas: tras cambiar unas pocas paredes solo se reparan
+# los vértices afectados en lugar de repetir la búsqueda completa. Requiere una
+# heurística consistente (sin weight ni desempates especiales).
+
+
+def _key_lt(a, b, eps=1e-9):
+    """a < b entre claves (k1, k2) tolerando el redondeo: g acumula costos √2 paso a
+    paso y h los multiplica, así que una clave igual puede salir unos ulps mayor."""
+    if a[0] < b[0] - eps:
+        return True
+    return abs(a[0] - b[0]) <= eps and a[1] < b[1] - eps
+
+
+class LPAStar:
+    def __init__(self, n, walls, start, end, connectivity=4, heuristic=None):
+        self.n = n
+        self.walls = bytearray(walls)
+        self.start, self.end = start, end
+        self.connectivity = connectivity
+        self.hfun = HEURISTICS[heuristic or DEFAULT_HEURISTIC[connectivity]]
+        total = n * n
+        self.g = array("d", [INF]) * total
+        self.rhs = array("d", [INF]) * total
+        self.rhs[start] = 0.0
+        self.heap = []
+        self.key = {}  # u -> clave vigente; las entradas del heap con otra clave están obsoletas
+        self.count = 0
+        self._push(start)
+
+    def _h(self, i):
+        er, ec = divmod(self.end, self.n)
+        return self.hfun(abs(i // self.n - er), abs(i % self.n - ec))
+
+    def _calc_key(self, u):
+        m = min(self.g[u], self.rhs[u])
+        return (m + self._h(u), m)
+
+    def _push(self, u):
+        k = self._calc_key(u)
+        self.key[u] = k
+        self.count += 1
+        heapq.heappush(self.heap, (k[0], k[1], self.count, u))
+
+    def _neighbors(self, u):
+        if self.walls[u]:
+            return ()
+        return grid_neighbors(u, self.n, self.walls, self.connectivity)
+
+    def _best_pred(self, u):
+        best, arg = INF, -1
+        for v, cost in self._neighbors(u):
+            if self.g[v] + cost < best:
+                best, arg = self.g[v] + cost, v
+        return best, arg
+
+    def _update_vertex(self, u):
+        if u != self.start:
+            self.rhs[u] = self._best_pred(u)[0]
+        self.key.pop(u, None)
+        if self.g[u] != self.rhs[u]:
+            self._push(u)
+
+    def _top_key(self):
+        heap = self.heap
+        while heap:
+            k1, k2, _, u = heap[0]
+            if self.key.get(u) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(heap)
+        return (INF, INF)
+
+    def update_cells(self, cells, walls):
+        """Aplica los cambios de pared de `cells` (índices) tomando el valor de `walls`."""
+        n = self.n
+        touched = set()
+        for i in cells:
+            if self.walls[i] == walls[i]:
+                continue
+            self.walls[i] = walls[i]
+            r, c = divmod(i, n)
+            for rr in (r - 1, r, r + 1):
+                for cc in (c - 1, c, c + 1):
+                    if 0 <= rr < n and 0 <= cc < n:
+                        touched.add(rr * n + cc)
+        for u in touched:
+            self._update_vertex(u)
+        return len(touched)
+
+    def compute(self, on_close=None, on_parent=None):
+        """Repara la búsqueda. Mismo contrato que astar_grid: (camino, vértices expandidos).
+
+        Los callbacks reciben cada vértice a lo sumo una vez por llamada, para que
+        la línea de tiempo de la web muestre la reparación como una búsqueda normal.
+        """
+        g, rhs, end = self.g, self.rhs, self.end
+        expanded = 0
+        closed, opened = set(), set()
+        while True:
+            top = self._top_key()
+            if top == (INF, INF) or not (_key_lt(top, self._calc_key(end)) or rhs[end] != g[end]):
+                break
+            _, _, _, u = heapq.heappop(self.heap)
+            del self.key[u]
+            expanded += 1
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+                if on_close and u not in closed:
+                    closed.add(u)
+                    on_close(u, g[u], g[u] + self._h(u), self._best_pred(u)[1])
+                for v, cost in self._neighbors(u):
+                    self._update_vertex(v)
+                    if on_parent and v in self.key and v not in closed and rhs[v] == g[u] + cost:
+                        on_parent(v, u, v not in opened)
+                        opened.add(v)
+            else:
+                g[u] = INF
+                for v, _ in list(self._neighbors(u)):
+                    self._update_vertex(v)
+                self._update_vertex(u)
+        return self.path(), expanded
+
+    def path(self):
+        if self.g[self.end] == INF:
+            return []
+        path = [self.end]
+        for _ in range(self.n * self.n):
+            if path[-1] == self.start:
+                path.reverse()
+                return path
+            path.append(self._best_pred(path[-1])[1])
+        return []
+
+
+def algorithm(draw, grid, start, end):
+    rows = len(grid)
+    walls = bytearray(1 if spot.is_barrier() else 0 for row in grid for spot in row)
+    spots = [spot for row in grid for spot in row]
+    s, e = start.row * rows + start.col, end.row * rows + end.col
+
+    def on_close(u, g, f, parent):
+        if u != s:
+            spots[u].make_closed()
+
+    def on_parent(v, u, new):
+        if new:
+            spots[v].make_open()
+
+    path, _ = astar_grid(rows, walls, s, e, on_close, on_parent)
+    if not path:
+        return False, []
+    came_from = {spots[v]: spots[u] for u, v in zip(path, path[1:])}
+    path = reconstruct_path(came_from, end, draw)
+    end.make_end()
+    return True, path
 
 
 def make_grid(rows, width):
@@ -2,13 +2,29 @@
 # Algoritmo: K-Nearest Neighbors (K-NN) — Lógica mínima para simulación web
 # Autor: Laura Herrera · Fecha: 2025-10-14
 #
-# Requisitos: Solo librerías estándar (math, random).
+# Requisitos: Librerías estándar (array, base64, heapq, itertools, math,
+#             random, sys, time).
+#             NumPy es opcional: acelera predecir_lote si está instalado.
 # Uso: Importado por app.py para la interfaz web. También puede ejecutarse
 #      en consola para una prueba rápida (ver bloque __main__).
 # ─────────────────────────────────────────────────────────────────────────────
 
+import base64
+import heapq
 import math
+from itertools import chain
 import random
+import sys
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # sin NumPy, predecir_lote consulta el índice punto a punto
+    np = None
+
+_LOTE_ELEMENTOS = 2_000_000   # tamaño máximo de cada bloque consultas x puntos
+_LOTE_DENSO_MAX = 1_500       # con más puntos el índice por consulta es más rápido
 
 """
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -16,7 +32,10 @@ import random
 ╠══════════════════════════════════════════════════════════════════════════════╣
 ║ distancia_euclidiana(p, q): retorna float                                   ║
 ║   p=(x1,y1), q=(x2,y2)                                                       ║
-║ voto_mayoritario(labels): resuelve empates por orden alfabético              ║
+║ voto_mayoritario(labels): resuelve empates por orden alfabético, en una     ║
+║   sola pasada O(k)                                                           ║
+║ k_menores(dists, k): los k pares (indice, distancia) más cercanos, con       ║
+║   heapq.nsmallest (O(n log k)) y el mismo orden que un sort estable          ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 def distancia_euclidiana(p, q):
@@ -26,33 +45,167 @@ def distancia_euclidiana(p, q):
 
 def voto_mayoritario(labels):
     conteo = {}
+    mejor, mejor_n = None, 0
     for l in labels:
-        conteo[l] = conteo.get(l, 0) + 1
-    # mayor frecuencia; desempate: etiqueta menor alfabéticamente
-    mejor = max(conteo.items(), key=lambda kv: (kv[1], -ord(kv[0][0])))
-    # mejor = (label, freq)
-    # En caso de varias letras con misma freq y primer char igual, orden total:
-    empatadas = [k for k, v in conteo.items() if v == mejor[1]]
-    return sorted(empatadas)[0]
+        n = conteo.get(l, 0) + 1
+        conteo[l] = n
+        # mayor frecuencia; desempate: etiqueta menor alfabéticamente
+        if n > mejor_n or (n == mejor_n and l < mejor):
+            mejor, mejor_n = l, n
+    return mejor
+
+def k_menores(dists, k):
+    # dists: iterable de (indice, distancia); la clave (d, i) reproduce el sort estable
+    return heapq.nsmallest(k, dists, key=lambda t: (t[1], t[0]))
 
 """
 ╔══════════════════════════════════════════════════════════════════════════════╗
-║ 2) Clase KNNModelo                                                           ║
+║ 2) Índice espacial (grilla uniforme)                                         ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
-║ Atributos:                                                                   ║
-║   puntos: list[(x:float, y:float, clase:str)]  # coords normalizadas [0..1]  ║
+║ El cuadrado [0..1]x[0..1] se divide en lado x lado celdas. Los índices de    ║
+║ los puntos quedan ordenados por celda en `orden` (array 'I') y la celda c    ║
+║ ocupa orden[inicio[c]:inicio[c+1]] (~6 bytes por punto). Los puntos nuevos   ║
+║ van a `pendientes` y la grilla se rehace (O(n)) cuando superan 1/4 del      ║
+║ total, así agregar es O(1) amortizado.                                       ║
+║ vecinos(x,y,k): recorre anillos de celdas alrededor de la consulta y para    ║
+║   cuando la k-ésima distancia es menor que la de cualquier celda no vista.   ║
+║   Orden por (distancia, índice): igual al sort estable de la versión lineal. ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+class IndiceGrilla:
+    def __init__(self, xs, ys):
+        self.xs, self.ys = xs, ys  # las mismas columnas del modelo (no se copian)
+        self.reconstruir()
+
+    def reconstruir(self):
+        n = len(self.xs)
+        self.lado = max(1, math.isqrt(n // 2))   # ~2 puntos por celda
+        self.paso = 1.0 / self.lado
+        celdas = array('I', (self._celda(px, py) for px, py in zip(self.xs, self.ys)))
+        # counting sort por celda
+        inicio = array('I', bytes(4 * (self.lado * self.lado + 1)))
+        for c in celdas:
+            inicio[c + 1] += 1
+        for c in range(1, len(inicio)):
+            inicio[c] += inicio[c - 1]
+        libre = inicio[:-1]
+        orden = array('I', bytes(4 * n))
+        for i, c in enumerate(celdas):
+            orden[libre[c]] = i
+            libre[c] += 1
+        self.inicio, self.orden = inicio, orden
+        self.pendientes = {}     # {celda: [indices agregados tras la última reconstrucción]}
+        self.n_pendientes = 0
+
+    def _coord(self, v: float) -> int:
+        return min(self.lado - 1, max(0, int(v * self.lado)))
+
+    def _celda(self, x: float, y: float) -> int:
+        return self._coord(y) * self.lado + self._coord(x)
+
+    def agregar(self, i: int):
+        # el punto i ya está en las columnas
+        if self.n_pendientes >= max(64, len(self.orden) // 4):
+            self.reconstruir()
+        else:
+            self.pendientes.setdefault(self._celda(self.xs[i], self.ys[i]), []).append(i)
+            self.n_pendientes += 1
+
+    def vecinos(self, x: float, y: float, k: int):
+        """Lista de (indice, distancia) de los k más cercanos, ordenada."""
+        xs, ys, lado = self.xs, self.ys, self.lado
+        orden, inicio, pendientes = self.orden, self.inicio, self.pendientes
+        cx, cy = self._coord(x), self._coord(y)
+        mejores = []   # max-heap de tamaño k con claves (-dist, -indice)
+        r = 0
+        while True:
+            for gy in range(cy - r, cy + r + 1):
+                if not 0 <= gy < lado:
+                    continue
+                borde = gy == cy - r or gy == cy + r
+                paso_x = 1 if borde else 2 * r   # en filas internas solo los extremos
+                for gx in range(cx - r, cx + r + 1, max(1, paso_x)):
+                    if not 0 <= gx < lado:
+                        continue
+                    c = gy * lado + gx
+                    for i in chain(orden[inicio[c]:inicio[c + 1]], pendientes.get(c, ())):
+                        d = math.hypot(x - xs[i], y - ys[i])
+                        if len(mejores) < k:
+                            heapq.heappush(mejores, (-d, -i))
+                        elif (d, i) < (-mejores[0][0], -mejores[0][1]):
+                            heapq.heapreplace(mejores, (-d, -i))
+            # los puntos de anillos > r están al menos a r*paso de la consulta;
+            # el margen cubre el redondeo de hypot y deja entrar los empates
+            if len(mejores) == k and -mejores[0][0] < r * self.paso * (1 - 1e-9):
+                break
+            if r >= lado:
+                break
+            r += 1
+        return sorted(((-mi, -md) for md, mi in mejores), key=lambda t: (t[1], t[0]))
+
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ 3) Clase KNNModelo                                                           ║
+╠══════════════════════════════════════════════════════════════════════════════╣
+║ Atributos (almacenamiento columnar, ~17 bytes por punto):                    ║
+║   xs, ys: array('d')            # coords normalizadas [0..1]                 ║
+║   etiquetas: array('B'|'H')     # código de clase de cada punto              ║
+║   tabla: list[str]              # código -> nombre de clase (orden de alta)  ║
 ║   k: int                                                                     ║
-║   clases: set[str]                                                           ║
+║   indice: IndiceGrilla sobre xs, ys (se mantiene al agregar/limpiar)         ║
+║   puntos: vista de solo lectura [(x, y, clase)] (compatibilidad)             ║
+║   clases: set[str] (derivado de tabla)                                       ║
 ║ Métodos (resumen):                                                           ║
 ║   agregar(x,y,c), limpiar(), aleatorios(n, clases)                           ║
+║   columnas() -> (xs, ys, etiquetas) como memoryviews, sin copiar             ║
+║   exportar(desde=0) -> dict compacto con las columnas en base64              ║
 ║   predecir(x,y,k=None) -> (label, vecinos:[(idx, dist)])                     ║
+║   predecir_lote(xs,ys,k=None) -> (clases ordenadas, códigos por consulta)    ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
+class _VistaPuntos:
+    # Secuencia [(x, y, clase)] armada al vuelo desde las columnas del modelo
+    def __init__(self, modelo):
+        self.m = modelo
+
+    def __len__(self):
+        return len(self.m.xs)
+
+    def __getitem__(self, i):
+        m = self.m
+        return m.xs[i], m.ys[i], m.tabla[m.etiquetas[i]]
+
+    def __iter__(self):
+        m = self.m
+        return ((x, y, m.tabla[c]) for x, y, c in zip(m.xs, m.ys, m.etiquetas))
+
+
+def _b64(columna, desde: int) -> str:
+    # columna[desde:] en little endian y base64
+    trozo = columna[desde:]
+    if sys.byteorder != "little":
+        trozo.byteswap()
+    return base64.b64encode(trozo.tobytes()).decode("ascii")
+
+
 class KNNModelo:
     def __init__(self, k: int = 3):
-        self.puntos = []     # [(x, y, 'A'|'B'|...)]
+        self.xs = array('d')
+        self.ys = array('d')
+        self.etiquetas = array('B')
+        self.tabla = []          # ['A', 'B', ...]
+        self._codigo = {}        # {'A': 0, 'B': 1, ...}
         self.k = max(1, int(k))
-        self.clases = set()
+        self.indice = IndiceGrilla(self.xs, self.ys)
+
+    @property
+    def puntos(self):
+        return _VistaPuntos(self)
+
+    @property
+    def clases(self):
+        return set(self.tabla)
 
     def set_k(self, k: int):
         self.k = max(1, int(k))
@@ -61,12 +214,39 @@ class KNNModelo:
         x = min(1.0, max(0.0, float(x)))
         y = min(1.0, max(0.0, float(y)))
         clase = str(clase)
-        self.puntos.append((x, y, clase))
-        self.clases.add(clase)
+        codigo = self._codigo.get(clase)
+        if codigo is None:
+            codigo = self._codigo[clase] = len(self.tabla)
+            self.tabla.append(clase)
+            if codigo > 255 and self.etiquetas.typecode == 'B':
+                self.etiquetas = array('H', self.etiquetas)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.etiquetas.append(codigo)
+        self.indice.agregar(len(self.xs) - 1)
 
     def limpiar(self):
-        self.puntos.clear()
-        self.clases.clear()
+        # se vacían en su lugar: el índice comparte xs/ys
+        del self.xs[:], self.ys[:]
+        self.etiquetas = array('B')
+        self.tabla.clear()
+        self._codigo.clear()
+        self.indice.reconstruir()
+
+    def columnas(self):
+        """(xs, ys, etiquetas) como memoryviews sobre las columnas, sin copiar;
+        np.asarray(...) las usa tal cual. Mientras existan no se puede agregar."""
+        return memoryview(self.xs), memoryview(self.ys), memoryview(self.etiquetas)
+
+    def exportar(self, desde: int = 0) -> dict:
+        """Puntos desde el índice `desde` en formato compacto para JSON:
+        x, y en float64 y c en enteros de `bytes_c` bytes, todos little endian
+        y en base64; c indexa la tabla de clases."""
+        desde = max(0, min(int(desde), len(self.xs)))
+        return {"n": len(self.xs), "desde": desde, "clases": list(self.tabla),
+                "bytes_c": self.etiquetas.itemsize,
+                "x": _b64(self.xs, desde), "y": _b64(self.ys, desde),
+                "c": _b64(self.etiquetas, desde)}
 
     def aleatorios(self, n: int = 40, clases=("A", "B")):
         for _ in range(max(0, int(n))):
@@ -76,25 +256,109 @@ class KNNModelo:
         """Devuelve (label_predicha, vecinos_ordenados)
         vecinos_ordenados = lista de (indice_en_dataset, distancia) de tamaño k.
         """
-        if not self.puntos:
+        if not self.xs:
+            return None, []
+        kk = max(1, int(k if k is not None else self.k))
+        vecinos = self.indice.vecinos(x, y, min(kk, len(self.xs)))
+        labels = [self.tabla[self.etiquetas[i]] for i, _ in vecinos]
+        pred = voto_mayoritario(labels)
+        return pred, vecinos
+
+    def predecir_lote(self, xs, ys, k: int | None = None):
+        """Clasifica muchas consultas de una vez (p. ej. una grilla de frontera).
+        Devuelve (clases, codigos): clases ordenadas alfabéticamente y, por cada
+        consulta, el índice de su clase predicha en `clases` (array 'B' o 'H').
+        Con NumPy calcula bloques de distancias al cuadrado y elige los k menores
+        con np.argpartition; los empates en la k-ésima distancia se resuelven por
+        menor índice y los del voto por clase menor, como predecir (salvo
+        diferencias de redondeo en el último bit entre d² y hypot)."""
+        clases = sorted(self.tabla)
+        codigos = array('B' if len(clases) <= 255 else 'H')
+        n = len(self.xs)
+        if n == 0:
+            return [], codigos
+        kk = min(n, max(1, int(k if k is not None else self.k)))
+        pos = {c: i for i, c in enumerate(clases)}
+        if np is None or n > _LOTE_DENSO_MAX:
+            codigos.extend(pos[self.predecir(x, y, kk)[0]] for x, y in zip(xs, ys))
+            return clases, codigos
+
+        vx, vy, vc = self.columnas()
+        px, py = np.asarray(vx), np.asarray(vy)        # sin copia
+        rango = np.array([pos[c] for c in self.tabla], np.intp)
+        etiquetas = rango[np.asarray(vc)]              # código de tabla -> código ordenado
+        qx, qy = np.asarray(xs, float), np.asarray(ys, float)
+        bloque = max(1, _LOTE_ELEMENTOS // n)
+        for ini in range(0, len(qx), bloque):
+            dx = qx[ini:ini + bloque, None] - px
+            dy = qy[ini:ini + bloque, None] - py
+            d2 = dx * dx + dy * dy
+            filas = len(d2)
+            if kk < n:
+                vecinos = np.argpartition(d2, kk - 1, axis=1)[:, :kk]
+                kesima = np.take_along_axis(d2, vecinos, axis=1).max(axis=1, keepdims=True)
+                # filas con empates que cruzan la k-ésima: se toman los de menor índice
+                for f in np.flatnonzero((d2 <= kesima).sum(axis=1) > kk):
+                    menores = np.flatnonzero(d2[f] < kesima[f])
+                    iguales = np.flatnonzero(d2[f] == kesima[f])
+                    vecinos[f] = np.concatenate((menores, iguales[:kk - len(menores)]))
+            else:
+                vecinos = np.broadcast_to(np.arange(n), (filas, n))
+            fila = np.repeat(np.arange(filas), kk)
+            votos = np.bincount(fila * len(clases) + etiquetas[vecinos].ravel(),
+                                minlength=filas * len(clases)).reshape(filas, len(clases))
+            codigos.extend(np.argmax(votos, axis=1).tolist())   # primer máximo = clase menor
+        return clases, codigos
+
+    def predecir_lineal(self, x: float, y: float, k: int | None = None):
+        """Recorrido lineal sin índice, O(n log k); sirve de referencia."""
+        if not self.xs:
             return None, []
         kk = max(1, int(k if k is not None else self.k))
-        # Distancias
-        dists = []
-        for i, (px, py, c) in enumerate(self.puntos):
-            d = distancia_euclidiana((x, y), (px, py))
-            dists.append((i, d))
-        dists.sort(key=lambda t: t[1])
-        vecinos = dists[:kk]
-        labels = [self.puntos[i][2] for i, _ in vecinos]
+        dists = ((i, math.hypot(x - px, y - py)) for i, (px, py) in enumerate(zip(self.xs, self.ys)))
+        vecinos = k_menores(dists, kk)
+        labels = [self.tabla[self.etiquetas[i]] for i, _ in vecinos]
         pred = voto_mayoritario(labels)
         return pred, vecinos
 
 
+def _predecir_ordenando(knn, x, y, k):
+    # Versión inicial: sort completo O(n log n) y voto con max + sort de empatadas
+    dists = [(i, distancia_euclidiana((x, y), (px, py))) for i, (px, py, _) in enumerate(knn.puntos)]
+    dists.sort(key=lambda t: t[1])
+    vecinos = dists[:k]
+    conteo = {}
+    for i, _ in vecinos:
+        conteo[knn.puntos[i][2]] = conteo.get(knn.puntos[i][2], 0) + 1
+    maximo = max(conteo.values())
+    return sorted(c for c, v in conteo.items() if v == maximo)[0], vecinos
+
+def comparar_velocidad(tamanos=(1_000, 10_000, 100_000), ks=(1, 5, 25), consultas: int = 50):
+    """Microbenchmark: ms por consulta según n y k para sort completo, heapq.nsmallest
+    y la grilla; verifica que las tres den lo mismo."""
+    print(f" {'n':>7} {'k':>3} {'sort':>9} {'nsmallest':>10} {'grilla':>8}  iguales")
+    for n in tamanos:
+        knn = KNNModelo()
+        knn.aleatorios(n, clases=("A", "B", "C"))
+        qs = [(random.random(), random.random()) for _ in range(consultas)]
+        for k in ks:
+            tiempos, resultados = [], []
+            for predecir in (lambda x, y: _predecir_ordenando(knn, x, y, k),
+                             lambda x, y: knn.predecir_lineal(x, y, k),
+                             lambda x, y: knn.predecir(x, y, k)):
+                inicio = time.perf_counter()
+                resultados.append([predecir(x, y) for x, y in qs])
+                tiempos.append((time.perf_counter() - inicio) * 1000 / consultas)
+            iguales = resultados[0] == resultados[1] == resultados[2]
+            print(f" {n:>7} {k:>3} {tiempos[0]:>9.3f} {tiempos[1]:>10.3f} {tiempos[2]:>8.3f}  {iguales}")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Prueba rápida en consola (opcional)
 # ─────────────────────────────────────────────────────────────────────────────
-if __name__ == "__main__":
+if __name__ == "__main__" and "--bench" in sys.argv:
+    comparar_velocidad()
+elif __name__ == "__main__":
     print("Demo KNN en consola (coords normalizadas [0..1])")
     knn = KNNModelo(k=3)
     knn.aleatorios(10, clases=("A", "B", "C"))
@@ -8,25 +8,346 @@
 ║  - Unigrama, Bigrama (como casos simples de n-gramas)                        ║
 ║  - Cadena de Markov de orden k (k≥1) con <START>/<END>                       ║
 ║  - Entrenamiento sobre un corpus, generación y consulta de distribuciones    ║
-║  - Sin librerías externas (solo re, random, collections)                     ║
+║  - Entrenamiento en flujo (ruta, archivo o iterador de trozos de texto)      ║
+║  - Vocabulario internado y tablas de n-gramas compactas (CSR)                ║
+║  - Sin librerías externas (solo re, random, collections, codecs, os, array)  ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 from __future__ import annotations
+import codecs
+import os
 import re
 import random
-from collections import Counter, defaultdict
-from typing import Dict, List, Tuple, Iterable, Optional
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict, deque
+from collections.abc import Mapping
+from typing import Dict, List, Tuple, Iterable, Iterator, Optional
 
 # -----------------------------------------------------------------------------
 # Utilidades
 # -----------------------------------------------------------------------------
+_PALABRA = re.compile(r"\b[a-zA-Z]+\b")
+_NO_PALABRA = re.compile(r"\W")
+TAM_BLOQUE = 1 << 16  # caracteres leídos por trozo al entrenar en flujo
+
 def extraer_palabras(texto: str) -> List[str]:
     """Extrae palabras [a-zA-Z]+ en minúsculas del texto."""
-    return re.findall(r"\b[a-zA-Z]+\b", (texto or "").lower())
+    return _PALABRA.findall((texto or "").lower())
+
+def _trozos(fuente, tam_bloque: int = TAM_BLOQUE) -> Iterator[str]:
+    """Texto en trozos desde una ruta, un archivo abierto (texto o binario UTF-8)
+    o un iterable de cadenas (que se usa tal cual)."""
+    if isinstance(fuente, (str, os.PathLike)):
+        with open(fuente, encoding="utf-8", errors="replace") as f:
+            yield from _trozos(f, tam_bloque)
+        return
+    if hasattr(fuente, "read"):
+        decodificar = None
+        while True:
+            trozo = fuente.read(tam_bloque)
+            if not trozo:
+                break
+            if isinstance(trozo, bytes):
+                if decodificar is None:
+                    decodificar = codecs.getincrementaldecoder("utf-8")(errors="replace").decode
+                trozo = decodificar(trozo)
+            yield trozo
+        if decodificar is not None:
+            yield decodificar(b"", final=True)
+        return
+    yield from fuente
+
+def palabras_en_flujo(fuente, tam_bloque: int = TAM_BLOQUE) -> Iterator[str]:
+    """
+    Igual que extraer_palabras pero sin cargar el texto entero: recorre los trozos
+    con finditer y guarda solo la cola posterior al último carácter no-palabra
+    (ahí ninguna coincidencia ni límite \\b depende del texto que sigue).
+    """
+    resto = yield from _palabras_cerradas(_trozos(fuente, tam_bloque))
+    yield from _PALABRA.findall(resto)
+
+def _palabras_cerradas(trozos: Iterable[str], resto: str = ""):
+    """Palabras que ya no pueden cambiar con más texto; retorna la cola abierta
+    (en minúsculas, sin caracteres no-palabra) como valor final del generador."""
+    for trozo in trozos:
+        texto = resto + trozo.lower()
+        for corte in range(len(texto) - 1, -1, -1):
+            if _NO_PALABRA.match(texto, corte):
+                break
+        else:
+            resto = texto  # todavía sin separador: sigue en la cola
+            continue
+        for m in _PALABRA.finditer(texto, 0, corte + 1):
+            yield m.group()
+        resto = texto[corte + 1:]
+    return resto
 
 def tok_start(k: int) -> Tuple[str, ...]:
     return tuple(["<START>"] * k)
 
+class MuestreadorAlias:
+    """
+    Tabla alias (método de Vose) sobre conteos enteros: se arma en O(m) y cada
+    muestra cuesta O(1) sin importar cuántos sucesores tenga el estado.
+    Trabaja en enteros (cada columna vale `total` unidades), así las
+    probabilidades son exactamente conteo / total.
+    """
+    def __init__(self, conteos: Dict[str, int]):
+        self.palabras = list(conteos.keys())
+        self.conteos = list(conteos.values())
+        m = len(self.palabras)
+        self.total = sum(conteos.values())
+        # columna i: con r uniforme en [0, total) sale i si r < umbral[i], si no alias[i]
+        escalado = [c * m for c in conteos.values()]
+        self.umbral = [self.total] * m
+        self.alias = list(range(m))
+        chicos = [i for i, u in enumerate(escalado) if u < self.total]
+        grandes = [i for i, u in enumerate(escalado) if u >= self.total]
+        while chicos and grandes:
+            c, g = chicos.pop(), grandes[-1]
+            self.umbral[c], self.alias[c] = escalado[c], g
+            escalado[g] -= self.total - escalado[c]
+            if escalado[g] < self.total:
+                chicos.append(grandes.pop())
+        # los que quedan (por construcción, exactamente total) se toman siempre
+
+    def muestra(self) -> str:
+        i = random.randrange(len(self.palabras))
+        if random.randrange(self.total) < self.umbral[i]:
+            return self.palabras[i]
+        return self.palabras[self.alias[i]]
+
+# -----------------------------------------------------------------------------
+# Almacenamiento compacto: vocabulario internado + tabla de n-gramas en CSR
+# -----------------------------------------------------------------------------
+class Vocabulario:
+    """Palabra <-> entero consecutivo (cabe en int32); cada palabra se guarda una vez."""
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.palabras: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.palabras)
+
+    def id(self, palabra: str) -> int:
+        i = self.ids.get(palabra)
+        if i is None:
+            i = self.ids[palabra] = len(self.palabras)
+            self.palabras.append(palabra)
+        return i
+
+    def ids_de(self, palabras: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        """Tupla de ids, o None si alguna palabra no está en el vocabulario."""
+        try:
+            return tuple(self.ids[w] for w in palabras)
+        except KeyError:
+            return None
+
+
+class TablaNgramas:
+    """
+    Conteos estado -> siguiente sobre ids enteros, en formato CSR:
+      columnas[j][i]           j-ésimo id del estado i (filas en orden lexicográfico)
+      inicio[i]:inicio[i+1]    rango de sus sucesores en siguientes / conteos
+    ~4k+4 bytes por estado y 8 por transición distinta. Buscar un estado son k
+    pares de bisect (en C) que acotan las filas columna por columna. Los cambios
+    se anotan en `delta` ({estado: {siguiente: +/-n}}) y compactar() los funde
+    con la base cuando pasan de 1/4 de ella, así sumar es O(1) amortizado.
+    """
+    DELTA_MIN = 4096
+
+    def __init__(self, orden: int):
+        self.orden = orden
+        self.columnas = [array('i') for _ in range(orden)]
+        self.inicio = array('I', [0])
+        self.siguientes = array('i')
+        self.conteos = array('I')
+        self.delta: Dict[Tuple[int, ...], Dict[int, int]] = {}
+        self.n_delta = 0                 # pares (estado, siguiente) anotados en delta
+        self.total = 0                   # suma de todos los conteos
+        self.frecuencia = array('I')     # id -> veces que aparece como siguiente
+        self.n_siguientes = 0            # ids distintos con frecuencia > 0
+
+    def sumar(self, estado: Tuple[int, ...], siguiente: int, n: int = 1) -> None:
+        d = self.delta.get(estado)
+        if d is None:
+            d = self.delta[estado] = {}
+        if siguiente not in d:
+            self.n_delta += 1
+        d[siguiente] = d.get(siguiente, 0) + n
+        self.total += n
+        frec = self.frecuencia
+        if siguiente >= len(frec):
+            frec.frombytes(bytes(frec.itemsize * (siguiente + 1 - len(frec))))
+        antes = frec[siguiente]
+        frec[siguiente] = antes + n
+        self.n_siguientes += (antes + n > 0) - (antes > 0)
+        if self.n_delta > max(self.DELTA_MIN, len(self.siguientes) // 4):
+            self.compactar()
+
+    def _buscar(self, estado: Tuple[int, ...], lo: int = 0) -> Tuple[int, bool]:
+        """(posición, encontrado): la fila del estado o dónde iría en el orden."""
+        hi = len(self.inicio) - 1
+        for col, i in zip(self.columnas, estado):
+            lo, hi = bisect_left(col, i, lo, hi), bisect_right(col, i, lo, hi)
+            if lo == hi:
+                return lo, False
+        return lo, True
+
+    def _base(self, i: int) -> Dict[int, int]:
+        a, b = self.inicio[i], self.inicio[i + 1]
+        return dict(zip(self.siguientes[a:b], self.conteos[a:b]))
+
+    def conteos_de(self, estado: Tuple[int, ...]) -> Dict[int, int]:
+        """{siguiente: conteo} del estado (vacío si no tiene transiciones)."""
+        i, esta = self._buscar(estado)
+        res = self._base(i) if esta else {}
+        for s, n in self.delta.get(estado, {}).items():
+            v = res.get(s, 0) + n
+            if v > 0:
+                res[s] = v
+            else:
+                res.pop(s, None)
+        return res
+
+    def __contains__(self, estado) -> bool:
+        return bool(self.conteos_de(estado))
+
+    def __len__(self) -> int:
+        # estados con conteo > 0: los de la base más lo que cambia en delta
+        n = len(self.inicio) - 1
+        for estado, d in self.delta.items():
+            cambio = sum(d.values())
+            if cambio:
+                i, esta = self._buscar(estado)
+                base = sum(self.conteos[self.inicio[i]:self.inicio[i + 1]]) if esta else 0
+                n += (base + cambio > 0) - (base > 0)
+        return n
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        self.compactar()
+        return zip(*self.columnas)
+
+    def items(self) -> Iterator[Tuple[Tuple[int, ...], Dict[int, int]]]:
+        self.compactar()
+        for i, estado in enumerate(zip(*self.columnas)):
+            yield estado, self._base(i)
+
+    def compactar(self) -> None:
+        """Funde delta con la base: copia en bloque las filas sin cambios y
+        rearma solo las de los estados tocados."""
+        if not self.delta:
+            return
+        columnas = [array('i') for _ in range(self.orden)]
+        inicio, siguientes, conteos = array('I', [0]), array('i'), array('I')
+
+        def copiar(i: int, j: int) -> None:
+            # filas base [i, j) tal cual, corrigiendo los offsets
+            if j <= i:
+                return
+            a, b = self.inicio[i], self.inicio[j]
+            corrimiento = len(siguientes) - a
+            for nueva, vieja in zip(columnas, self.columnas):
+                nueva.extend(vieja[i:j])
+            siguientes.extend(self.siguientes[a:b])
+            conteos.extend(self.conteos[a:b])
+            inicio.extend(x + corrimiento for x in self.inicio[i + 1:j + 1])
+
+        i = 0
+        for estado in sorted(self.delta):
+            p, esta = self._buscar(estado, i)
+            copiar(i, p)
+            res = self._base(p) if esta else {}
+            i = p + esta
+            for s, n in self.delta[estado].items():
+                res[s] = res.get(s, 0) + n
+            vivos = sorted(s for s, v in res.items() if v > 0)
+            if vivos:
+                for col, id_ in zip(columnas, estado):
+                    col.append(id_)
+                siguientes.extend(vivos)
+                conteos.extend(res[s] for s in vivos)
+                inicio.append(len(siguientes))
+        copiar(i, len(self.inicio) - 1)
+        self.columnas, self.inicio, self.siguientes, self.conteos = columnas, inicio, siguientes, conteos
+        self.delta.clear()
+        self.n_delta = 0
+
+
+class _VistaTransiciones(Mapping):
+    """
+    {estado: Counter(siguiente)} con palabras, leído de una TablaNgramas sin
+    materializarla: cada acceso decodifica solo ese estado. Con simple=True las
+    claves son palabras sueltas en lugar de tuplas de una palabra.
+    """
+    def __init__(self, vocab: Vocabulario, tabla: TablaNgramas, simple: bool = False):
+        self.vocab, self.tabla, self.simple = vocab, tabla, simple
+
+    def _ids(self, estado):
+        return self.vocab.ids_de((estado,) if self.simple else estado)
+
+    def __getitem__(self, estado) -> Counter:
+        ids = self._ids(estado)
+        conteos = self.tabla.conteos_de(ids) if ids is not None else None
+        if not conteos:
+            raise KeyError(estado)
+        p = self.vocab.palabras
+        return Counter({p[s]: n for s, n in conteos.items()})
+
+    def __contains__(self, estado) -> bool:
+        ids = self._ids(estado)
+        return ids is not None and ids in self.tabla
+
+    def __iter__(self):
+        p = self.vocab.palabras
+        for ids in self.tabla:
+            yield p[ids[0]] if self.simple else tuple(p[i] for i in ids)
+
+    def items(self):
+        # un solo recorrido de la tabla, sin volver a buscar cada estado
+        p = self.vocab.palabras
+        for ids, conteos in self.tabla.items():
+            estado = p[ids[0]] if self.simple else tuple(p[i] for i in ids)
+            yield estado, Counter({p[s]: n for s, n in conteos.items()})
+
+    def values(self):
+        return (c for _, c in self.items())
+
+    def __len__(self) -> int:
+        return len(self.tabla)
+
+
+class _VistaBigramas(Mapping):
+    # {(w0, w1): conteo} sobre la tabla de orden 1 de ModeloBigrama
+    def __init__(self, vocab: Vocabulario, tabla: TablaNgramas):
+        self.vocab, self.tabla = vocab, tabla
+
+    def __getitem__(self, par) -> int:
+        ids = self.vocab.ids_de(par)
+        n = self.tabla.conteos_de(ids[:1]).get(ids[1], 0) if ids is not None else 0
+        if n <= 0:
+            raise KeyError(par)
+        return n
+
+    def __iter__(self):
+        p = self.vocab.palabras
+        for (w0,), conteos in self.tabla.items():
+            for w1 in conteos:
+                yield (p[w0], p[w1])
+
+    def items(self):
+        p = self.vocab.palabras
+        for (w0,), conteos in self.tabla.items():
+            for w1, n in conteos.items():
+                yield (p[w0], p[w1]), n
+
+    def __len__(self) -> int:
+        self.tabla.compactar()
+        return len(self.tabla.siguientes)
+
 # -----------------------------------------------------------------------------
 # Corpus base (puedes editarlo/expandirlo desde la UI)
 # -----------------------------------------------------------------------------
@@ -1412,10 +1733,13 @@ class ModeloUnigrama:
         self.vocab = set()
 
     def entrenar(self, corpus: str) -> None:
-        palabras = extraer_palabras(corpus)
-        self.conteos = Counter(palabras)
-        self.total = len(palabras)
-        self.vocab = set(palabras)
+        self.entrenar_flujo([corpus or ""])
+
+    def entrenar_flujo(self, fuente, tam_bloque: int = TAM_BLOQUE) -> None:
+        """Entrena desde una ruta, un archivo abierto o un iterable de trozos de texto."""
+        self.conteos = Counter(palabras_en_flujo(fuente, tam_bloque))
+        self.total = sum(self.conteos.values())
+        self.vocab = set(self.conteos)
 
     def prob(self, w: str) -> float:
         if self.total == 0:
@@ -1440,28 +1764,61 @@ class ModeloBigrama:
     Modelo de Bigramas: P(w_i | w_{i-1}) = conteo(w_{i-1}, w_i) / conteo(w_{i-1})
     """
     def __init__(self):
-        self.bigramas = Counter()
         self.unigramas = Counter()
-        self.vocab = set()
         self.inicios = []  # palabras posibles de inicio
+        self._vocabulario = Vocabulario()
+        self._tabla = TablaNgramas(1)   # (w0,) -> w1 en ids: índice de bigramas por contexto
+        self._muestreadores = {}  # w0 -> MuestreadorAlias (se arma al primer uso)
+
+    @property
+    def sucesores(self) -> Mapping:
+        """w0 -> Counter(w1), leído de la tabla compacta."""
+        return _VistaTransiciones(self._vocabulario, self._tabla, simple=True)
+
+    @property
+    def bigramas(self) -> Mapping:
+        """(w0, w1) -> conteo, leído de la tabla compacta."""
+        return _VistaBigramas(self._vocabulario, self._tabla)
+
+    @property
+    def vocab(self):
+        return self.unigramas.keys()
 
     def entrenar(self, corpus: str) -> None:
-        pal = extraer_palabras(corpus)
-        self.vocab = set(pal)
-        self.unigramas = Counter(pal)
-        for i in range(len(pal)-1):
-            self.bigramas[(pal[i], pal[i+1])] += 1
+        self.entrenar_flujo([corpus or ""])
+
+    def entrenar_flujo(self, fuente, tam_bloque: int = TAM_BLOQUE) -> None:
+        """Entrena desde una ruta, un archivo abierto o un iterable de trozos de texto,
+        sin materializar la lista de palabras."""
+        self.unigramas = Counter()
+        self._vocabulario = Vocabulario()
+        self._tabla = TablaNgramas(1)
+        self._muestreadores.clear()
+        interno = self._vocabulario.id
+        previa = None
+        for w in palabras_en_flujo(fuente, tam_bloque):
+            self.unigramas[w] += 1
+            i = interno(w)
+            if previa is not None:
+                self._tabla.sumar((previa,), i)
+            previa = i
+        self._tabla.compactar()
         self.inicios = list(self.vocab)
 
+    def _muestreador(self, contexto: str) -> Optional[MuestreadorAlias]:
+        mu = self._muestreadores.get(contexto)
+        if mu is None:
+            conteos = self.sucesores.get(contexto)
+            if not conteos:
+                return None
+            mu = self._muestreadores[contexto] = MuestreadorAlias(conteos)
+        return mu
+
     def dist_siguiente(self, contexto: str) -> Dict[str, float]:
         if contexto not in self.unigramas:
             return {}
         base = self.unigramas[contexto]
-        dist = {}
-        for (w0, w1), cnt in self.bigramas.items():
-            if w0 == contexto:
-                dist[w1] = cnt / base
-        return dist
+        return {w1: cnt / base for w1, cnt in self.sucesores.get(contexto, {}).items()}
 
     def generar(self, palabra_inicio: Optional[str] = None, longitud: int = 10) -> List[str]:
         if not self.unigramas:
@@ -1474,12 +1831,10 @@ class ModeloBigrama:
                 return []
         salida = [actual]
         for _ in range(longitud-1):
-            dist = self.dist_siguiente(actual)
-            if not dist:
+            mu = self._muestreador(actual)
+            if mu is None:
                 break
-            palabras = list(dist.keys())
-            pesos = list(dist.values())
-            nxt = random.choices(palabras, weights=pesos)[0]
+            nxt = mu.muestra()
             salida.append(nxt)
             actual = nxt
         return salida
@@ -1494,38 +1849,119 @@ class CadenaMarkov:
     """
     def __init__(self, orden: int = 2):
         self.orden = max(1, int(orden))
-        self.transiciones = defaultdict(Counter)  # estado -> Counter(siguiente)
-        self.estados = set()
+        self._vaciar()
+
+    def _vaciar(self) -> None:
+        self._vocabulario = Vocabulario()
+        self._tabla = TablaNgramas(self.orden)   # estado (ids) -> siguiente (id)
+        self._inicio = (self._vocabulario.id("<START>"),) * self.orden
+        self._id_fin = self._vocabulario.id("<END>")
+        self._muestreadores = {}  # estado (ids) -> MuestreadorAlias (se arma al primer uso)
+        # Borde del texto entrenado, para actualizar(): ventana antes de la cola
+        # abierta, la cola misma (una palabra a medias o nada) y el estado que
+        # cerró con <END> (None si no se entrenó todavía).
+        self._ventana = self._inicio
+        self._cola = ""
+        self._fin = None
+
+    @property
+    def transiciones(self) -> Mapping:
+        """estado (tupla de palabras) -> Counter(siguiente), leído de la tabla compacta."""
+        return _VistaTransiciones(self._vocabulario, self._tabla)
+
+    @property
+    def estados(self):
+        return self.transiciones.keys()
+
+    def n_vocab(self) -> int:
+        """Tokens distintos que aparecen como siguiente (incluye <END>)."""
+        return self._tabla.n_siguientes
+
+    def n_transiciones(self) -> int:
+        """Total de transiciones contadas (suma de todos los conteos)."""
+        return self._tabla.total
 
     def entrenar(self, corpus: str) -> None:
-        pal = extraer_palabras(corpus)
-        proc = list(tok_start(self.orden)) + pal + ["<END>"]
-        self.transiciones.clear()
-        self.estados.clear()
-        for i in range(len(proc) - self.orden):
-            estado = tuple(proc[i:i+self.orden])
-            nxt = proc[i+self.orden]
-            self.transiciones[estado][nxt] += 1
-            self.estados.add(estado)
+        self.entrenar_flujo([corpus or ""])
+
+    def entrenar_flujo(self, fuente, tam_bloque: int = TAM_BLOQUE) -> None:
+        """
+        Entrena desde una ruta, un archivo abierto o un iterable de trozos de texto.
+        Las palabras se leen en flujo y el estado es una ventana deque de `orden`
+        tokens: la memoria depende de la tabla de transiciones, no del corpus.
+        """
+        self._vaciar()   # vocabulario y tabla nuevos
+        self._seguir(_trozos(fuente, tam_bloque), self._inicio, "")
+        self._tabla.compactar()
+
+    def actualizar(self, texto: str) -> None:
+        """
+        Suma al modelo el texto agregado al final del corpus, en tiempo
+        proporcional al texto nuevo. Queda igual que entrenar(corpus + texto):
+        se descuenta el <END> anterior y, si el corpus terminaba en una palabra
+        que el texto nuevo puede alargar ("hel" + "lo"), también esa palabra.
+        """
+        if self._fin is None:
+            self.entrenar(texto)
+            return
+        self._contar(self._fin, self._id_fin, -1)
+        for w in _PALABRA.findall(self._cola):   # a lo sumo una
+            self._contar(self._ventana, self._vocabulario.id(w), -1)
+        self._seguir([texto or ""], self._ventana, self._cola)
+
+    def _seguir(self, trozos: Iterable[str], ventana: Tuple[int, ...], cola: str) -> None:
+        # Cuenta las palabras desde `ventana`, cierra con <END> y guarda el borde
+        interno = self._vocabulario.id
+        ventana = deque(ventana, maxlen=self.orden)
+        cerradas = _palabras_cerradas(trozos, cola)
+        while True:
+            try:
+                nxt = interno(next(cerradas))
+            except StopIteration as fin:
+                cola = fin.value
+                break
+            self._contar(tuple(ventana), nxt)
+            ventana.append(nxt)
+        self._ventana, self._cola = tuple(ventana), cola
+        for w in _PALABRA.findall(cola):
+            nxt = interno(w)
+            self._contar(tuple(ventana), nxt)
+            ventana.append(nxt)
+        self._fin = tuple(ventana)
+        self._contar(self._fin, self._id_fin)
+
+    def _contar(self, estado: Tuple[int, ...], nxt: int, n: int = 1) -> None:
+        self._tabla.sumar(estado, nxt, n)
+        self._muestreadores.pop(estado, None)
+
+    def _muestreador(self, estado: Tuple[str, ...]) -> Optional[MuestreadorAlias]:
+        """Tabla alias del estado, armada una sola vez mientras no cambien sus conteos."""
+        ids = self._vocabulario.ids_de(estado)
+        if ids is None:
+            return None
+        mu = self._muestreadores.get(ids)
+        if mu is None:
+            conteos = self._tabla.conteos_de(ids)
+            if not conteos:
+                return None
+            p = self._vocabulario.palabras
+            mu = self._muestreadores[ids] = MuestreadorAlias({p[s]: n for s, n in conteos.items()})
+        return mu
 
     def dist_siguiente(self, estado: Tuple[str, ...]) -> Dict[str, float]:
-        if estado not in self.transiciones:
+        mu = self._muestreador(estado)
+        if mu is None or mu.total == 0:
             return {}
-        total = sum(self.transiciones[estado].values())
-        if total == 0:
-            return {}
-        return {w: c/total for w, c in self.transiciones[estado].items()}
+        return {w: c / mu.total for w, c in zip(mu.palabras, mu.conteos)}
 
     def generar(self, max_tokens: int = 30) -> List[str]:
         estado = tok_start(self.orden)
         salida = []
         for _ in range(max_tokens):
-            dist = self.dist_siguiente(estado)
-            if not dist:
+            mu = self._muestreador(estado)
+            if mu is None:
                 break
-            palabras = list(dist.keys())
-            pesos = list(dist.values())
-            nxt = random.choices(palabras, weights=pesos)[0]
+            nxt = mu.muestra()
             if nxt == "<END>":
                 break
             salida.append(nxt)
@@ -1535,21 +1971,55 @@ class CadenaMarkov:
     # Ayuda para simulación paso a paso (UI)
     def paso(self, estado: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Optional[str]]:
         """Devuelve (nuevo_estado, token_elegido | None)"""
-        dist = self.dist_siguiente(estado)
-        if not dist:
+        mu = self._muestreador(estado)
+        if mu is None:
             return (estado, None)
-        palabras = list(dist.keys())
-        pesos = list(dist.values())
-        nxt = random.choices(palabras, weights=pesos)[0]
+        nxt = mu.muestra()
         if nxt == "<END>":
             return (estado, "<END>")
         nuevo = (*estado[1:], nxt)
         return (nuevo, nxt)
 
+# -----------------------------------------------------------------------------
+# Benchmark: costo por token del bigrama (python markov-algorithm.py --bench [libro.txt])
+# -----------------------------------------------------------------------------
+def _dist_recorriendo(modelo: ModeloBigrama, contexto: str) -> Dict[str, float]:
+    # Versión inicial de dist_siguiente: recorre toda la tabla de bigramas
+    base = modelo.unigramas[contexto]
+    return {w1: cnt / base for (w0, w1), cnt in modelo.bigramas.items() if w0 == contexto}
+
+def comparar_bigramas(ruta: Optional[str] = None, tokens: int = 2000) -> None:
+    """Microsegundos por token generado con y sin el índice por contexto, sobre un
+    libro en texto plano (p. ej. uno de Gutenberg) o el corpus de ejemplo."""
+    if ruta:
+        with open(ruta, encoding="utf-8", errors="replace") as f:
+            corpus = f.read()
+    else:
+        corpus = ai_corpus
+    m = ModeloBigrama()
+    inicio = time.perf_counter()
+    m.entrenar(corpus)
+    print(f" entrenar: {time.perf_counter() - inicio:.2f} s, {len(m.bigramas)} bigramas, "
+          f"{len(m.vocab)} palabras")
+    contextos = random.choices(list(m.sucesores), k=tokens)
+    iguales = all(_dist_recorriendo(m, w) == m.dist_siguiente(w) for w in contextos[:50])
+    for nombre, siguiente in (
+            ("recorrido", lambda w: random.choices(*zip(*_dist_recorriendo(m, w).items()))[0]),
+            ("índice", lambda w: m._muestreador(w).muestra())):
+        n = tokens if nombre == "índice" else max(1, tokens // 20)
+        inicio = time.perf_counter()
+        for w in contextos[:n]:
+            siguiente(w)
+        print(f" {nombre:>9}: {(time.perf_counter() - inicio) / n * 1e6:,.1f} us/token")
+    print(" distribuciones iguales:", iguales)
+
 # -----------------------------------------------------------------------------
 # Demo CLI 
 # -----------------------------------------------------------------------------
-if __name__ == "__main__":
+if __name__ == "__main__" and "--bench" in sys.argv:
+    args = sys.argv[sys.argv.index("--bench") + 1:]
+    comparar_bigramas(args[0] if args else None)
+elif __name__ == "__main__":
     print("Demo Markov (orden=2) — generar 30 tokens")
     m = CadenaMarkov(orden=2)
     m.entrenar(ai_corpus)
@@ -14,9 +14,44 @@
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 import os
+import sys
+import time
 import random
 import math
 
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ 0) Tablero en bits                                                           ║
+║ ──────────────────────────────────────────────────────────────────────────── ║
+║  Dos enteros de 9 bits (x, o): el bit i vale 1 si la casilla i tiene esa     ║
+║  ficha. Las 8 lineas ganadoras son mascaras precalculadas y, como solo hay   ║
+║  512 combinaciones, "gana" y el conteo de fichas se leen de tablas.          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+LINEAS = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6))
+MASCARAS_LINEA = tuple((1 << a) | (1 << b) | (1 << c) for a, b, c in LINEAS)
+LLENO = 0x1FF
+GANA = bytes(any(b & m == m for m in MASCARAS_LINEA) for b in range(512))
+FICHAS = bytes(bin(b).count("1") for b in range(512))
+
+# tipo de entrada en las tablas de transposicion (JugadorComputadora y BuscadorMNK):
+# valor exacto, o solo cota inferior/superior cuando la busqueda se corto por la ventana
+EXACTO, INFERIOR, SUPERIOR = 0, 1, 2
+
+def a_bits(estado: list[str]) -> tuple:
+    # Adaptador lista -> bits: ['X','-','O',...] -> (x, o)
+    x = o = 0
+    for i, c in enumerate(estado):
+        if c == 'X':
+            x |= 1 << i
+        elif c == 'O':
+            o |= 1 << i
+    return x, o
+
+def a_lista(x: int, o: int) -> list[str]:
+    # Adaptador bits -> lista, el formato que usan TicTacToe y app.py
+    return ['X' if x >> i & 1 else 'O' if o >> i & 1 else '-' for i in range(9)]
+
 """     Módulo principal: clase TicTacToe y lógica del juego.
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║ 1) class TicTacToe()                                                         ║
@@ -176,13 +211,19 @@ class JugadorHumano:
 ║  Atributos:                                                                  ║
 ║      jugadorBot (string): 'X','O'.                                           ║
 ║      jugadorHumano (string): 'X','O' asignada al humano.                     ║
+║      jugadorAbre (string): ficha que abrio la partida (por defecto el        ║
+║                            humano; en autojuego siempre 'X').                ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 class JugadorComputadora(TicTacToe):
+    libro = None # LibroAperturas (minimax-libro.py); si es None siempre se busca
     # Inicializa constructor
-    def __init__(self, letra: str):
+    def __init__(self, letra: str, abre: str = None):
         self.jugadorBot = letra
         self.jugadorHumano = "X" if letra == "O" else "O" # letra contraria al bot
+        self.jugadorAbre = abre or self.jugadorHumano # en la consola siempre abre el humano
+        self._tt = {} # tabla de transposicion: (tablero, jugador, humano, abre) -> (puntaje, tipo, posicion)
+        self.estadisticas = {"nodos": 0, "aciertos_tt": 0, "cortes": 0}
     """
     ╔══════════════════════════════════════════════════════════════════════════════╗
     ║ FUNCION:                                                                     ║
@@ -194,7 +235,7 @@ class JugadorComputadora(TicTacToe):
         # suma de posiciones mas una para deducir el turno hasta (9)
         x = sum(1 for c in estado if c == "X")
         o = sum(1 for c in estado if c == "O")
-        if self.jugadorHumano == "X":
+        if self.jugadorAbre == "X":
             return "X" if x == o else "O"
         return "O" if x == o else "X"
     """ 
@@ -233,12 +274,109 @@ class JugadorComputadora(TicTacToe):
     """
     ╔══════════════════════════════════════════════════════════════════════════════╗
     ║ FUNCION:                                                                     ║
-    ║   minimax(estado, jugador): Algoritmo Minimax recursivo                      ║
+    ║   minimax(estado, jugador): Minimax con poda alfa-beta y tabla de            ║
+    ║                             transposicion (mismas jugadas que el completo).  ║
     ║       retorna: dict {'position': mejor_indice, 'score': puntaje}.            ║
+    ║       estadisticas: nodos, aciertos_tt y cortes de la ultima llamada.        ║
     ╚══════════════════════════════════════════════════════════════════════════════╝
     """
-    # Algoritmo Minimax recursivo tomando los tres estados posibles:      
     def minimax(self, estado: list[str], jugador: str) -> dict:
+        self.estadisticas = {"nodos": 0, "aciertos_tt": 0, "cortes": 0}
+        x, o = a_bits(estado)
+        # ventana completa en la raiz: gana la primera casilla con el mejor puntaje, igual que antes
+        puntaje, casilla = self._alfabeta(x, o, jugador == 'X', -math.inf, math.inf)
+        return {'position': casilla, 'score': puntaje}
+
+    def _alfabeta(self, x: int, o: int, juega_x: bool, alfa: float, beta: float) -> tuple:
+        # Mismo puntaje que minimax_completo, sobre el tablero en bits.
+        self.estadisticas["nodos"] += 1
+        humano_x = self.jugadorHumano == 'X'
+        ocupadas = x | o
+        if GANA[x] or GANA[o]:
+            libre = 9 - FICHAS[ocupadas] + 1
+            # el que acaba de jugar (el otro) suma si es el humano
+            return ((1 * libre) if juega_x != humano_x else (-1 * libre)), None
+        elif ocupadas == LLENO:
+            return 0, None
+
+        abre_x = self.jugadorAbre == 'X'
+        clave = x | o << 9 | juega_x << 18 | humano_x << 19 | abre_x << 20
+        entrada = self._tt.get(clave)
+        if entrada is not None:
+            valor, tipo, casilla = entrada
+            if (tipo == EXACTO or (tipo == INFERIOR and valor >= beta)
+                    or (tipo == SUPERIOR and valor <= alfa)):
+                self.estadisticas["aciertos_tt"] += 1
+                return valor, casilla
+
+        alfa0, beta0 = alfa, beta
+        maximiza = juega_x == humano_x
+        mejor, mejor_casilla = (-math.inf if maximiza else math.inf), None
+        # la misma ficha que pondria resultado(): jugador_de_turno a partir del conteo
+        ficha_x = (FICHAS[x] == FICHAS[o]) == abre_x
+        libres = LLENO & ~ocupadas
+        while libres:
+            bit = libres & -libres  # casillas en orden creciente, como acciones()
+            libres ^= bit
+            if ficha_x:
+                valor, _ = self._alfabeta(x | bit, o, not juega_x, alfa, beta)
+            else:
+                valor, _ = self._alfabeta(x, o | bit, not juega_x, alfa, beta)
+            if maximiza:
+                if valor > mejor:
+                    mejor, mejor_casilla = valor, bit.bit_length() - 1
+                alfa = max(alfa, mejor)
+            else:
+                if valor < mejor:
+                    mejor, mejor_casilla = valor, bit.bit_length() - 1
+                beta = min(beta, mejor)
+            if alfa >= beta:
+                self.estadisticas["cortes"] += 1
+                break
+
+        # fuera de la ventana original el valor solo es una cota
+        if mejor <= alfa0:
+            tipo = SUPERIOR
+        elif mejor >= beta0:
+            tipo = INFERIOR
+        else:
+            tipo = EXACTO
+        self._tt[clave] = (mejor, tipo, mejor_casilla)
+        return mejor, mejor_casilla
+
+    def completo_bits(self, x: int, o: int, juega_x: bool) -> int:
+        # Minimax completo en bits (mismo arbol que minimax_completo), para comparar nodos/segundo
+        self.estadisticas["nodos"] += 1
+        humano_x = self.jugadorHumano == 'X'
+        ocupadas = x | o
+        if GANA[x] or GANA[o]:
+            libre = 9 - FICHAS[ocupadas] + 1
+            return (1 * libre) if juega_x != humano_x else (-1 * libre)
+        elif ocupadas == LLENO:
+            return 0
+        maximiza = juega_x == humano_x
+        ficha_x = (FICHAS[x] == FICHAS[o]) == (self.jugadorAbre == 'X')
+        puntajes = []
+        libres = LLENO & ~ocupadas
+        while libres:
+            bit = libres & -libres
+            libres ^= bit
+            if ficha_x:
+                puntajes.append(self.completo_bits(x | bit, o, not juega_x))
+            else:
+                puntajes.append(self.completo_bits(x, o | bit, not juega_x))
+        return max(puntajes) if maximiza else min(puntajes)
+    """
+    ╔══════════════════════════════════════════════════════════════════════════════╗
+    ║ FUNCION:                                                                     ║
+    ║   minimax_completo(estado, jugador): Algoritmo Minimax recursivo sin poda    ║
+    ║                                      (referencia para comparar nodos).       ║
+    ║       retorna: dict {'position': mejor_indice, 'score': puntaje}.            ║
+    ╚══════════════════════════════════════════════════════════════════════════════╝
+    """
+    # Algoritmo Minimax recursivo tomando los tres estados posibles:      
+    def minimax_completo(self, estado: list[str], jugador: str) -> dict:
+        self.estadisticas["nodos"] += 1
         max_jugador = self.jugadorHumano # el humano es el quien busca la maxima puntuacion
         otro = 'O' if jugador == 'X' else 'X' # el otro jugador
         # 1) Si el estado es terminal (gana X u O), retorna un puntaje.
@@ -259,7 +397,7 @@ class JugadorComputadora(TicTacToe):
         # 3) Si no, explora todas las acciones posibles y elige la mejor según el jugador.
         for mov in self.acciones(estado):
             nuevo = self.resultado(estado, mov)
-            puntaje = self.minimax(nuevo, otro) #llamada recursiva a la puntuacion
+            puntaje = self.minimax_completo(nuevo, otro) #llamada recursiva a la puntuacion
             # añadimos la posicion a mov
             puntaje = {'position': mov, 'score': puntaje['score']}
 
@@ -275,15 +413,636 @@ class JugadorComputadora(TicTacToe):
     ╔══════════════════════════════════════════════════════════════════════════════╗
     ║ FUNCION:                                                                     ║
     ║   movimiento_maquina(estado): Realiza el movimiento de la maquina mediante   ║
-    ║                               Minimax.                                       ║
+    ║                               el libro de aperturas o, si no aplica, Minimax.║
     ║       retorna: Posicion (0-8) de la casilla elegida por la IA.               ║
     ╚══════════════════════════════════════════════════════════════════════════════╝
     """
     def movimiento_maquina(self, estado: list[str]) -> int:
+        # El libro resuelve el juego real; solo coincide con minimax cuando el turno
+        # deducido del tablero es el del bot.
+        if self.libro is not None and self.jugador_de_turno(estado) == self.jugadorBot:
+            casilla = self.libro.jugada(estado, self.jugadorBot)
+            if casilla is not None:
+                return casilla
         casilla = self.minimax(estado, self.jugadorBot)['position'] #mueve la posicion a la que quiere ir la maquina
         return casilla
 
-# Iniciar el juego
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ 4) class JuegoMNK                                                            ║
+║ ──────────────────────────────────────────────────────────────────────────── ║
+║  Juego m,n,k: tablero de m filas x n columnas, gana quien hace k en linea    ║
+║  (3,3,3 es el triqui; 4,4,4 o 5,5,4 tipo gomoku reducido).                   ║
+║  Atributos:                                                                  ║
+║      lineas (tuple[int]): mascaras de bits de todos los segmentos de k.      ║
+║      lineas_de (tuple[tuple[int]]): segmentos que pasan por cada casilla.    ║
+║      vecindad (tuple[int]): mascara de las 8 casillas vecinas de cada una.   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+class JuegoMNK:
+
+    def __init__(self, m: int = 3, n: int = 3, k: int = 3):
+        if not (1 <= k <= max(m, n)):
+            raise ValueError("k debe caber en el tablero")
+        self.m, self.n, self.k = m, n, k
+        self.celdas = m * n
+        self.lleno = (1 << self.celdas) - 1
+        lineas = []
+        for f in range(m):
+            for c in range(n):
+                for df, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    if 0 <= f + df * (k - 1) < m and 0 <= c + dc * (k - 1) < n:
+                        lineas.append(sum(1 << ((f + df * t) * n + c + dc * t) for t in range(k)))
+        self.lineas = tuple(lineas)
+        self.lineas_de = tuple(tuple(l for l in lineas if l >> i & 1) for i in range(self.celdas))
+        self.vecindad = tuple(
+            sum(1 << (ff * n + cc)
+                for ff in range(f - 1, f + 2) for cc in range(c - 1, c + 2)
+                if 0 <= ff < m and 0 <= cc < n and (ff, cc) != (f, c))
+            for f in range(m) for c in range(n))
+        # orden estatico: primero las casillas del centro
+        cf, cc = (m - 1) / 2, (n - 1) / 2
+        self.por_centro = tuple(sorted(range(self.celdas),
+                                       key=lambda i: (abs(i // n - cf) + abs(i % n - cc), i)))
+
+    def gana(self, bits: int, casilla: int = None) -> bool:
+        # Con casilla solo se miran los segmentos que pasan por ella (la ultima jugada)
+        lineas = self.lineas if casilla is None else self.lineas_de[casilla]
+        return any(bits & l == l for l in lineas)
+
+    def linea_ganadora(self, bits: int) -> list:
+        for l in self.lineas:
+            if bits & l == l:
+                return [i for i in range(self.celdas) if l >> i & 1]
+        return []
+
+    def a_bits(self, tablero: list) -> tuple:
+        x = o = 0
+        for i, c in enumerate(tablero):
+            if c == 'X':
+                x |= 1 << i
+            elif c == 'O':
+                o |= 1 << i
+        return x, o
+
+    def a_lista(self, x: int, o: int) -> list:
+        return ['X' if x >> i & 1 else 'O' if o >> i & 1 else '-' for i in range(self.celdas)]
+
+
+class _SinTiempo(Exception):
+    pass
+
+
+def _contar(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ 5) class BuscadorMNK                                                         ║
+║ ──────────────────────────────────────────────────────────────────────────── ║
+║  Negamax alfa-beta con profundizacion iterativa y presupuesto de tiempo      ║
+║  por jugada: devuelve la mejor casilla de la ultima profundidad completa.    ║
+║  Orden de jugadas: la de la tabla de transposicion, luego historial de       ║
+║  cortes y cercania al centro. En tableros grandes solo se prueban casillas   ║
+║  vecinas a fichas ya puestas.                                                ║
+║  Atributos:                                                                  ║
+║      presupuesto (float): segundos por jugada.                               ║
+║      estadisticas (dict): nodos, profundidad y tiempo de la ultima jugada.   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+class BuscadorMNK:
+    GANAR = 1_000_000
+    TT_MAX = 1_000_000
+
+    def __init__(self, juego: JuegoMNK, presupuesto: float = 0.5):
+        self.juego = juego
+        self.presupuesto = presupuesto
+        self._tt = {} # (mias, suyas) -> (profundidad, valor, tipo, casilla)
+        self.estadisticas = {"nodos": 0, "profundidad": 0, "segundos": 0.0}
+
+    def mejor_jugada(self, x: int, o: int, juega_x: bool):
+        """Casilla para quien mueve (juega_x=True si es 'X'); None si la partida termino."""
+        j = self.juego
+        if not j.lleno & ~(x | o) or j.gana(x) or j.gana(o):
+            return None
+        inicio = time.perf_counter()
+        self._limite = inicio + self.presupuesto
+        self._nodos = 0
+        self._historia = [0] * j.celdas
+        if len(self._tt) > self.TT_MAX:
+            self._tt.clear()
+        mias, suyas = (x, o) if juega_x else (o, x)
+        mejor = self._candidatas(mias, suyas, None)[0]
+        profundidad = 0
+        try:
+            for prof in range(1, _contar(j.lleno & ~(x | o)) + 1):
+                valor, casilla = self._raiz(mias, suyas, prof, mejor)
+                mejor, profundidad = casilla, prof
+                if abs(valor) >= self.GANAR - j.celdas:
+                    break # resultado forzado: mas profundidad no lo cambia
+        except _SinTiempo:
+            pass # se queda la jugada de la ultima profundidad completa
+        self.estadisticas = {"nodos": self._nodos, "profundidad": profundidad,
+                             "segundos": round(time.perf_counter() - inicio, 3)}
+        return mejor
+
+    def _raiz(self, mias: int, suyas: int, prof: int, previa: int) -> tuple:
+        alfa, mejor_casilla = -math.inf, previa
+        for c in self._candidatas(mias, suyas, previa):
+            valor = self._valor_jugada(mias, suyas, c, prof, alfa, math.inf)
+            if valor > alfa:
+                alfa, mejor_casilla = valor, c
+        return alfa, mejor_casilla
+
+    def _valor_jugada(self, mias, suyas, c, prof, alfa, beta):
+        nuevas = mias | (1 << c)
+        if self.juego.gana(nuevas, c):
+            # ganar antes vale mas (mas casillas libres al final)
+            return self.GANAR + _contar(self.juego.lleno & ~(nuevas | suyas))
+        return -self._negamax(suyas, nuevas, prof - 1, -beta, -alfa)
+
+    def _negamax(self, mias: int, suyas: int, prof: int, alfa: float, beta: float) -> float:
+        self._nodos += 1
+        if self._nodos & 255 == 0 and time.perf_counter() > self._limite:
+            raise _SinTiempo()
+        if not self.juego.lleno & ~(mias | suyas):
+            return 0
+        if prof == 0:
+            return self._evaluar(mias, suyas)
+        clave = (mias, suyas)
+        entrada = self._tt.get(clave)
+        previa = None
+        if entrada is not None:
+            eprof, valor, tipo, previa = entrada
+            if eprof >= prof and (tipo == EXACTO
+                                  or (tipo == INFERIOR and valor >= beta)
+                                  or (tipo == SUPERIOR and valor <= alfa)):
+                return valor
+        alfa0 = alfa
+        mejor, mejor_casilla = -math.inf, None
+        for c in self._candidatas(mias, suyas, previa):
+            valor = self._valor_jugada(mias, suyas, c, prof, alfa, beta)
+            if valor > mejor:
+                mejor, mejor_casilla = valor, c
+            alfa = max(alfa, valor)
+            if alfa >= beta:
+                self._historia[c] += prof * prof
+                break
+        if mejor <= alfa0:
+            tipo = SUPERIOR
+        elif mejor >= beta:
+            tipo = INFERIOR
+        else:
+            tipo = EXACTO
+        self._tt[clave] = (prof, mejor, tipo, mejor_casilla)
+        return mejor
+
+    def _candidatas(self, mias: int, suyas: int, previa) -> list:
+        j = self.juego
+        ocupadas = mias | suyas
+        libres = j.lleno & ~ocupadas
+        if j.celdas > 16 and ocupadas:
+            cerca = 0
+            b = ocupadas
+            while b:
+                bit = b & -b
+                b ^= bit
+                cerca |= j.vecindad[bit.bit_length() - 1]
+            libres &= cerca
+        historia = self._historia
+        orden = sorted((i for i in j.por_centro if libres >> i & 1), key=lambda i: -historia[i])
+        if previa is not None and previa in orden:
+            orden.remove(previa)
+            orden.insert(0, previa)
+        return orden
+
+    def _evaluar(self, mias: int, suyas: int) -> float:
+        # Segmentos abiertos: 4^fichas a favor de quien los ocupa en exclusiva
+        total = 0
+        for l in self.juego.lineas:
+            a, b = mias & l, suyas & l
+            if a and not b:
+                total += 4 ** _contar(a)
+            elif b and not a:
+                total -= 4 ** _contar(b)
+        return total
+
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ 6) class JugadorMCTS                                                         ║
+║ ──────────────────────────────────────────────────────────────────────────── ║
+║  Monte Carlo Tree Search (UCT) con la interfaz de JugadorComputadora:        ║
+║  movimiento_maquina(estado). Sirve para cualquier JuegoMNK y es "anytime":   ║
+║  corta al llegar a `playouts` simulaciones o a `tiempo` segundos.            ║
+║  Atributos:                                                                  ║
+║      jugadorBot (string): 'X','O'.                                           ║
+║      juego (JuegoMNK): tablero y lineas (3,3,3 por defecto).                 ║
+║      c (float): constante de exploracion de UCT.                             ║
+║      estadisticas (dict): playouts y segundos de la ultima jugada.           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+class _NodoMCTS:
+    __slots__ = ("casilla", "padre", "hijos", "sin_probar", "visitas", "puntos", "de_x", "fin")
+
+    def __init__(self, casilla, padre, sin_probar, de_x, fin=None):
+        self.casilla = casilla       # jugada que lleva a este nodo
+        self.padre = padre
+        self.hijos = []
+        self.sin_probar = sin_probar # jugadas aun no expandidas
+        self.visitas = 0
+        self.puntos = 0.0            # victorias (empate = 0.5) de quien hizo `casilla`
+        self.de_x = de_x             # True si `casilla` la jugo 'X'
+        self.fin = fin               # None, 'gana' (gano quien jugo) o 'empate'
+
+class JugadorMCTS:
+
+    def __init__(self, letra: str, juego: "JuegoMNK" = None, playouts: int = 5000,
+                 tiempo: float = 0.5, c: float = 1.4, semilla: int = None):
+        self.jugadorBot = letra
+        self.jugadorHumano = "X" if letra == "O" else "O"
+        self.juego = juego or JuegoMNK(3, 3, 3)
+        self.playouts = playouts
+        self.tiempo = tiempo
+        self.c = c
+        self.rng = random.Random(semilla)
+        self.estadisticas = {"playouts": 0, "segundos": 0.0}
+
+    def _jugadas(self, ocupadas: int) -> list:
+        j = self.juego
+        libres = j.lleno & ~ocupadas
+        if j.celdas > 16 and ocupadas:
+            # en tableros grandes solo se abren casillas vecinas a fichas puestas
+            cerca, b = 0, ocupadas
+            while b:
+                bit = b & -b
+                b ^= bit
+                cerca |= j.vecindad[bit.bit_length() - 1]
+            libres = (libres & cerca) or libres
+        return [i for i in range(j.celdas) if libres >> i & 1]
+
+    def _simular(self, x: int, o: int, turno_x: bool):
+        # Partida al azar hasta el final: 'X', 'O' o None (empate)
+        j = self.juego
+        ocupadas = x | o
+        libres = [i for i in range(j.celdas) if not ocupadas >> i & 1]
+        self.rng.shuffle(libres)
+        for c in libres:
+            if turno_x:
+                x |= 1 << c
+                if j.gana(x, c):
+                    return 'X'
+            else:
+                o |= 1 << c
+                if j.gana(o, c):
+                    return 'O'
+            turno_x = not turno_x
+        return None
+
+    def movimiento_maquina(self, estado: list[str]) -> int:
+        j = self.juego
+        x, o = j.a_bits(estado)
+        if not j.lleno & ~(x | o) or j.gana(x) or j.gana(o):
+            return None
+        juega_x = self.jugadorBot == 'X'
+        raiz = _NodoMCTS(None, None, self._jugadas(x | o), not juega_x)
+        log, sqrt, c = math.log, math.sqrt, self.c
+        inicio = time.perf_counter()
+        limite = inicio + self.tiempo
+        hechos = 0
+        while hechos < self.playouts and time.perf_counter() < limite:
+            nodo, bx, bo = raiz, x, o
+            # 1) seleccion: UCT mientras el nodo este completamente expandido
+            while not nodo.sin_probar and nodo.hijos and nodo.fin is None:
+                lnp = log(nodo.visitas)
+                nodo = max(nodo.hijos, key=lambda h: h.puntos / h.visitas + c * sqrt(lnp / h.visitas))
+                if nodo.de_x:
+                    bx |= 1 << nodo.casilla
+                else:
+                    bo |= 1 << nodo.casilla
+            # 2) expansion de una jugada no probada
+            if nodo.fin is None and nodo.sin_probar:
+                casilla = nodo.sin_probar.pop(self.rng.randrange(len(nodo.sin_probar)))
+                de_x = not nodo.de_x
+                if de_x:
+                    bx |= 1 << casilla
+                    gano = j.gana(bx, casilla)
+                else:
+                    bo |= 1 << casilla
+                    gano = j.gana(bo, casilla)
+                fin = 'gana' if gano else ('empate' if (bx | bo) == j.lleno else None)
+                hijo = _NodoMCTS(casilla, nodo, [] if fin else self._jugadas(bx | bo), de_x, fin)
+                nodo.hijos.append(hijo)
+                nodo = hijo
+            # 3) simulacion
+            if nodo.fin == 'gana':
+                ganador = 'X' if nodo.de_x else 'O'
+            elif nodo.fin == 'empate':
+                ganador = None
+            else:
+                ganador = self._simular(bx, bo, not nodo.de_x)
+            # 4) retropropagacion
+            while nodo is not None:
+                nodo.visitas += 1
+                if ganador is None:
+                    nodo.puntos += 0.5
+                elif (ganador == 'X') == nodo.de_x:
+                    nodo.puntos += 1.0
+                nodo = nodo.padre
+            hechos += 1
+        self.estadisticas = {"playouts": hechos, "segundos": round(time.perf_counter() - inicio, 3)}
+        if not raiz.hijos:
+            return raiz.sin_probar[0]
+        return max(raiz.hijos, key=lambda h: h.visitas).casilla
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ FUNCION:                                                                     ║
+║   comparar_nodos(): Nodos visitados en el tablero vacio por el minimax       ║
+║                     completo y por alfa-beta con tabla de transposicion.     ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+def comparar_nodos():
+    vacio = ['-'] * 9
+    bot = JugadorComputadora('O')
+    bot.estadisticas["nodos"] = 0
+    completo = bot.minimax_completo(vacio, 'X')
+    print(f" Minimax completo: {bot.estadisticas['nodos']} nodos, jugada {completo['position']}")
+    rapido = bot.minimax(vacio, 'X')
+    print(f" Alfa-beta + TT:   {bot.estadisticas['nodos']} nodos "
+          f"({bot.estadisticas['aciertos_tt']} aciertos TT, {bot.estadisticas['cortes']} cortes), "
+          f"jugada {rapido['position']}")
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ FUNCION:                                                                     ║
+║   comparar_velocidad(): Nodos por segundo del minimax completo con listas    ║
+║                         frente al mismo arbol recorrido con bits.            ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+def comparar_velocidad():
+    import time
+    bot = JugadorComputadora('O')
+    for nombre, buscar in (("listas", lambda: bot.minimax_completo(['-'] * 9, 'X')),
+                           ("bits", lambda: bot.completo_bits(0, 0, True))):
+        bot.estadisticas["nodos"] = 0
+        inicio = time.perf_counter()
+        buscar()
+        segundos = time.perf_counter() - inicio
+        nodos = bot.estadisticas["nodos"]
+        print(f" {nombre:>6}: {nodos} nodos en {segundos:.2f} s = {nodos / segundos:,.0f} nodos/s")
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ FUNCION:                                                                     ║
+║   verificar_buscador(posiciones, semilla): Compara BuscadorMNK._raiz a       ║
+║             profundidad fija con un negamax sin poda ni tabla (mismas        ║
+║             hojas y evaluacion) en posiciones al azar de 3x3 y 4x4 (k=3).    ║
+║       retorna: numero de posiciones revisadas; AssertionError si difieren.   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+def _negamax_plano(juego: "JuegoMNK", buscador: "BuscadorMNK", mias: int, suyas: int, prof: int):
+    # Referencia: recorre todas las casillas libres, sin ventana ni tabla de transposicion
+    if not juego.lleno & ~(mias | suyas):
+        return 0
+    if prof == 0:
+        return buscador._evaluar(mias, suyas)
+    return max(_valor_plano(juego, buscador, mias, suyas, c, prof)
+               for c in range(juego.celdas) if not (mias | suyas) >> c & 1)
+
+def _valor_plano(juego, buscador, mias, suyas, c, prof):
+    nuevas = mias | (1 << c)
+    if juego.gana(nuevas, c):
+        return BuscadorMNK.GANAR + _contar(juego.lleno & ~(nuevas | suyas))
+    return -_negamax_plano(juego, buscador, suyas, nuevas, prof - 1)
+
+def verificar_buscador(posiciones: int = 150, semilla: int = 0) -> int:
+    rng = random.Random(semilla)
+    revisadas = 0
+    for m, n, k, prof_max in ((3, 3, 3, 6), (4, 4, 3, 3)):
+        juego = JuegoMNK(m, n, k)
+        buscador = BuscadorMNK(juego, presupuesto=math.inf)
+        for _ in range(posiciones):
+            # posicion alcanzable al azar, sin ganador y con al menos dos casillas libres
+            x = o = 0
+            for t in range(rng.randrange(2, juego.celdas - 1)):
+                c = rng.choice([i for i in range(juego.celdas) if not (x | o) >> i & 1])
+                if t % 2 == 0:
+                    x |= 1 << c
+                else:
+                    o |= 1 << c
+                if juego.gana(x) or juego.gana(o):
+                    break
+            if juego.gana(x) or juego.gana(o):
+                continue
+            juega_x = _contar(x) == _contar(o)
+            mias, suyas = (x, o) if juega_x else (o, x)
+            buscador._tt.clear()
+            buscador._limite, buscador._nodos = math.inf, 0
+            buscador._historia = [0] * juego.celdas
+            previa = buscador._candidatas(mias, suyas, None)[0]
+            for prof in range(1, min(prof_max, _contar(juego.lleno & ~(x | o))) + 1):
+                valor, casilla = buscador._raiz(mias, suyas, prof, previa)
+                esperado = _negamax_plano(juego, buscador, mias, suyas, prof)
+                elegido = _valor_plano(juego, buscador, mias, suyas, casilla, prof)
+                assert valor == esperado and elegido == esperado, (
+                    f"{m}x{n} k={k} prof {prof} {juego.a_lista(x, o)}: raiz {valor} en {casilla} "
+                    f"(vale {elegido}), negamax {esperado}")
+                previa = casilla
+            revisadas += 1
+    return revisadas
+
+def cargar_libro():
+    # Carga minimax-libro.py (nombre con guion) desde la misma carpeta y su libro en disco
+    import importlib.util
+    ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "minimax-libro.py")
+    spec = importlib.util.spec_from_file_location("minimax_libro", ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo.cargar()
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ 7) Autojuego sin consola                                                     ║
+║ ──────────────────────────────────────────────────────────────────────────── ║
+║  Partidas maquina contra maquina (sin os.system ni input) repartidas en un   ║
+║  pool de procesos. Agentes: "minimax" (JugadorComputadora), "libro"          ║
+║  (JugadorComputadora con libro de aperturas), "mcts" (JugadorMCTS, 2000      ║
+║  playouts) y "random". X siempre abre.                                       ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+AGENTES = ("minimax", "libro", "mcts", "random")
+_LIBRO = None # libro cargado una vez por proceso
+
+class JugadorAleatorio:
+    # Misma interfaz que JugadorComputadora: elige una casilla libre al azar
+    def __init__(self, letra: str, rng: random.Random = None):
+        self.jugadorBot = letra
+        self.rng = rng or random.Random()
+
+    def movimiento_maquina(self, estado: list[str]) -> int:
+        libres = [i for i, c in enumerate(estado) if c == '-']
+        return self.rng.choice(libres) if libres else None
+
+def crear_agente(nombre: str, letra: str, semilla: int = None):
+    global _LIBRO
+    if nombre == "random":
+        return JugadorAleatorio(letra, random.Random(semilla))
+    if nombre == "mcts":
+        return JugadorMCTS(letra, playouts=2000, tiempo=math.inf, semilla=semilla)
+    if nombre not in AGENTES:
+        raise ValueError(f"Agente desconocido: {nombre} (opciones: {', '.join(AGENTES)})")
+    bot = JugadorComputadora(letra, abre='X') # en autojuego siempre abre X
+    if nombre == "libro":
+        if _LIBRO is None:
+            _LIBRO = cargar_libro()
+        bot.libro = _LIBRO
+    return bot
+
+def jugar_partida(agente_x, agente_o) -> tuple:
+    # retorna (resultado 'X'/'O'/'=', jugadas, segundos pensando)
+    tablero = ['-'] * 9
+    x = o = 0
+    turno, jugadas, segundos = 'X', 0, 0.0
+    while True:
+        agente = agente_x if turno == 'X' else agente_o
+        inicio = time.perf_counter()
+        casilla = agente.movimiento_maquina(tablero)
+        segundos += time.perf_counter() - inicio
+        if casilla is None or not 0 <= casilla < 9 or tablero[casilla] != '-':
+            raise ValueError(f"Jugada ilegal de {turno}: {casilla}")
+        tablero[casilla] = turno
+        jugadas += 1
+        if turno == 'X':
+            x |= 1 << casilla
+            if GANA[x]:
+                return 'X', jugadas, segundos
+        else:
+            o |= 1 << casilla
+            if GANA[o]:
+                return 'O', jugadas, segundos
+        if jugadas == 9:
+            return '=', jugadas, segundos
+        turno = 'O' if turno == 'X' else 'X'
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ FUNCION:                                                                     ║
+║   verificar_agentes(): Con X siempre abriendo, los agentes "minimax" y       ║
+║             "libro" en cada lado contra todas las respuestas posibles:       ║
+║             nunca pierden, toman la victoria inmediata si la hay y ambos     ║
+║             eligen la misma casilla.                                         ║
+║       retorna: posiciones revisadas; AssertionError si algo falla.           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+def verificar_agentes() -> int:
+    revisadas = 0
+    for letra in ('X', 'O'):
+        minimax, libro = crear_agente("minimax", letra), crear_agente("libro", letra)
+        rival = 'O' if letra == 'X' else 'X'
+        pendientes = [['-'] * 9]
+        while pendientes:
+            tablero = pendientes.pop()
+            x, o = a_bits(tablero)
+            turno = 'X' if FICHAS[x] == FICHAS[o] else 'O'
+            if GANA[x] or GANA[o] or (x | o) == LLENO:
+                assert not GANA[o if letra == 'X' else x], f"{letra} pierde en {tablero}"
+                continue
+            libres = [i for i in range(9) if tablero[i] == '-']
+            if turno == rival:
+                for i in libres:
+                    pendientes.append(tablero[:i] + [rival] + tablero[i + 1:])
+                continue
+            casilla = minimax.movimiento_maquina(tablero)
+            assert casilla == libro.movimiento_maquina(tablero), f"minimax y libro difieren en {tablero}"
+            mias = x if letra == 'X' else o
+            if any(GANA[mias | 1 << i] for i in libres):
+                assert GANA[mias | 1 << casilla], f"{letra} no gana de inmediato en {tablero}"
+            pendientes.append(tablero[:casilla] + [letra] + tablero[casilla + 1:])
+            revisadas += 1
+    return revisadas
+
+def _jugar_lote(tarea: tuple) -> tuple:
+    # Trabajo de un proceso: los agentes (y su tabla de transposicion) se reutilizan en el lote
+    nombre_x, nombre_o, partidas, semilla = tarea
+    agente_x = crear_agente(nombre_x, 'X', semilla)
+    agente_o = crear_agente(nombre_o, 'O', semilla + 1)
+    conteo = {'X': 0, 'O': 0, '=': 0}
+    jugadas, segundos = 0, 0.0
+    for _ in range(partidas):
+        resultado, j, s = jugar_partida(agente_x, agente_o)
+        conteo[resultado] += 1
+        jugadas += j
+        segundos += s
+    return conteo, jugadas, segundos
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ FUNCION:                                                                     ║
+║   autojuego(nombre_x, nombre_o, partidas, procesos, semilla): Juega las      ║
+║             partidas en lotes repartidos en un pool de procesos.             ║
+║       retorna: dict con victorias/empates, tasas y jugadas por segundo.      ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+def autojuego(nombre_x: str, nombre_o: str, partidas: int = 1000,
+              procesos: int = None, semilla: int = 0) -> dict:
+    from concurrent.futures import ProcessPoolExecutor
+    for nombre in (nombre_x, nombre_o):
+        if nombre not in AGENTES:
+            raise ValueError(f"Agente desconocido: {nombre} (opciones: {', '.join(AGENTES)})")
+    procesos = max(1, procesos or os.cpu_count() or 1)
+    tam = max(1, -(-partidas // (procesos * 4))) # ~4 lotes por proceso para repartir bien
+    tareas = [(nombre_x, nombre_o, min(tam, partidas - i), semilla + 2 * i)
+              for i in range(0, partidas, tam)]
+    inicio = time.perf_counter()
+    if procesos == 1:
+        resultados = [_jugar_lote(t) for t in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(_jugar_lote, tareas))
+    reloj = time.perf_counter() - inicio
+    conteo = {'X': 0, 'O': 0, '=': 0}
+    jugadas, segundos = 0, 0.0
+    for c, j, s in resultados:
+        for r in conteo:
+            conteo[r] += c[r]
+        jugadas += j
+        segundos += s
+    return {
+        "x": nombre_x, "o": nombre_o, "partidas": partidas, "procesos": procesos,
+        "gana_x": conteo['X'], "gana_o": conteo['O'], "empates": conteo['='],
+        "tasa_x": conteo['X'] / partidas, "tasa_o": conteo['O'] / partidas,
+        "tasa_empate": conteo['='] / partidas,
+        "jugadas": jugadas,
+        "jugadas_por_segundo": jugadas / segundos if segundos else float("inf"),
+        "partidas_por_segundo": partidas / reloj if reloj else float("inf"),
+    }
+
+def _imprimir_autojuego(r: dict) -> None:
+    print(f" {r['x']} (X) vs {r['o']} (O): {r['partidas']} partidas en {r['procesos']} procesos")
+    print(f"   gana X {r['gana_x']} ({r['tasa_x']:.1%}) • gana O {r['gana_o']} ({r['tasa_o']:.1%}) "
+          f"• empates {r['empates']} ({r['tasa_empate']:.1%})")
+    print(f"   {r['jugadas_por_segundo']:,.0f} jugadas/s por agente • {r['partidas_por_segundo']:,.0f} partidas/s")
+
+# Iniciar el juego:
+#   --nodos compara los dos minimax, --bench mide nodos/s listas vs bits,
+#   --verificar compara la busqueda con poda contra un negamax sin poda y
+#               revisa los agentes del autojuego en ambos lados,
+#   --autojuego [x] [o] [partidas] [procesos] juega maquina contra maquina sin consola
 if __name__ == "__main__":
-    tictactoe = TicTacToe()
-    tictactoe.iniciar()
\ No newline at end of file
+    if "--nodos" in sys.argv:
+        comparar_nodos()
+    elif "--bench" in sys.argv:
+        comparar_velocidad()
+    elif "--verificar" in sys.argv:
+        print(f" BuscadorMNK = negamax sin poda en {verificar_buscador()} posiciones")
+        print(f" minimax y libro (X abre) sin derrotas en {verificar_agentes()} posiciones")
+    elif "--autojuego" in sys.argv:
+        args = sys.argv[sys.argv.index("--autojuego") + 1:]
+        x = args[0] if len(args) > 0 else "minimax"
+        o = args[1] if len(args) > 1 else "random"
+        partidas = int(args[2]) if len(args) > 2 else 1000
+        procesos = int(args[3]) if len(args) > 3 else None
+        _imprimir_autojuego(autojuego(x, o, partidas, procesos))
+    else:
+        JugadorComputadora.libro = cargar_libro()
+        tictactoe = TicTacToe()
+        tictactoe.iniciar()
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                 LIBRO DE APERTURAS DEL TRIQUI (Python)                       ║
+╠══════════════════════════════════════════════════════════════════════════════╣
+║ Proyecto:        (Tic Tac Toe) complemento de minimax-algorithm.py.          ║
+║ Descripción:     Resuelve el juego completo una sola vez y guarda, por       ║
+║                  posicion canonica (reducida por las 8 simetrias del         ║
+║                  tablero), el puntaje y la mascara de casillas optimas.      ║
+║                  Se guarda en disco y se carga al iniciar, asi la jugada     ║
+║                  de la maquina es una consulta de tiempo constante.          ║
+║ Librerias:      Solo estándar (array, os, struct, sys, pathlib).             ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Convenciones:                                                                ║
+║   - Una posicion se normaliza para que mueva siempre 'X' (si mueve 'O' se    ║
+║     intercambian las fichas) y se codifica en base 3: '-'=0, 'X'=1, 'O'=2.   ║
+║   - El puntaje es el del minimax del juego visto por quien mueve:            ║
+║     +(vacias+1) si gana, -(vacias+1) si pierde, 0 si empata.                 ║
+║   - Cada entrada se empaqueta en 16 bits: (puntaje + 16) << 9 | mascara.     ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+RUTA_LIBRO = Path(__file__).with_name("minimax-libro.bin")
+_MAGIA = b"TTT1"
+
+LINEAS = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6))
+
+# SIMETRIAS[k][i] = casilla del tablero original que ocupa la casilla i tras la simetria k
+_ROTAR = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+_ESPEJO = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+
+
+def _componer(a, b):
+    return tuple(a[b[i]] for i in range(9))
+
+
+def _simetrias():
+    sims, t = [], tuple(range(9))
+    for _ in range(4):
+        sims.append(t)
+        sims.append(_componer(t, _ESPEJO))
+        t = _componer(t, _ROTAR)
+    return tuple(sims)
+
+
+SIMETRIAS = _simetrias()
+_VALOR = {'-': 0, 'X': 1, 'O': 2}
+_POT3 = tuple(3 ** i for i in range(9))
+
+
+def _gana(tablero, ficha) -> bool:
+    return any(tablero[a] == tablero[b] == tablero[c] == ficha for a, b, c in LINEAS)
+
+
+def _normalizar(tablero, ficha: str) -> list:
+    # Deja el tablero como si moviera 'X'
+    if ficha == 'X':
+        return list(tablero)
+    cambio = {'X': 'O', 'O': 'X', '-': '-'}
+    return [cambio[c] for c in tablero]
+
+
+def canonica(tablero) -> tuple:
+    """
+    ╔══════════════════════════════════════════════════════════════════════════╗
+    ║ FUNCION:                                                                 ║
+    ║   canonica(tablero): Menor codigo base 3 entre las 8 simetrias.          ║
+    ║       retorna: (codigo, simetria usada).                                 ║
+    ╚══════════════════════════════════════════════════════════════════════════╝
+    """
+    valores = [_VALOR[c] for c in tablero]
+    mejor = None
+    for sim in SIMETRIAS:
+        codigo = 0
+        for i in range(9):
+            codigo += valores[sim[i]] * _POT3[i]
+        if mejor is None or codigo < mejor[0]:
+            mejor = (codigo, sim)
+    return mejor
+
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ FUNCION:                                                                     ║
+║   resolver(): Recorre todo el juego desde el tablero vacio (negamax con      ║
+║               memoria sobre posiciones canonicas).                           ║
+║       retorna: dict {codigo canonico: entrada empaquetada}.                  ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+def resolver() -> dict:
+    libro = {}
+
+    def valor(tablero) -> int:
+        # tablero normalizado (mueve 'X'), sin ganador y con casillas libres
+        codigo, sim = canonica(tablero)
+        if codigo in libro:
+            return (libro[codigo] >> 9) - 16
+        puntajes = [None] * 9
+        for i in range(9):
+            if tablero[i] != '-':
+                continue
+            tablero[i] = 'X'
+            libres = tablero.count('-')
+            if _gana(tablero, 'X'):
+                puntajes[i] = libres + 1
+            elif libres == 0:
+                puntajes[i] = 0
+            else:
+                puntajes[i] = -valor(_normalizar(tablero, 'O'))
+            tablero[i] = '-'
+        mejor = max(p for p in puntajes if p is not None)
+        # mascara en la orientacion canonica: la casilla canonica i es la original sim[i]
+        mascara = 0
+        for i in range(9):
+            if puntajes[sim[i]] == mejor:
+                mascara |= 1 << i
+        libro[codigo] = ((mejor + 16) << 9) | mascara
+        return mejor
+
+    valor(['-'] * 9)
+    return libro
+
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ FUNCION:                                                                     ║
+║   guardar(libro, ruta): Escribe codigos y entradas como dos arreglos de      ║
+║                         16 bits (little endian) tras una cabecera.           ║
+║   cargar(ruta): Lee el libro; si falta o esta dañado lo resuelve y guarda.   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+def guardar(libro: dict, ruta=RUTA_LIBRO) -> None:
+    codigos = array('H', sorted(libro))
+    entradas = array('H', (libro[c] for c in codigos))
+    if sys.byteorder != 'little':
+        codigos.byteswap()
+        entradas.byteswap()
+    ruta = Path(ruta)
+    temporal = ruta.with_name(f"{ruta.name}.{os.getpid()}.tmp")
+    with open(temporal, 'wb') as f:
+        f.write(_MAGIA + struct.pack('<I', len(codigos)))
+        f.write(codigos.tobytes())
+        f.write(entradas.tobytes())
+    os.replace(temporal, ruta) # reemplazo atomico: otro proceso nunca lee un archivo a medias
+
+
+def cargar(ruta=RUTA_LIBRO) -> "LibroAperturas":
+    ruta = Path(ruta)
+    try:
+        datos = ruta.read_bytes()
+        if datos[:4] != _MAGIA:
+            raise ValueError("cabecera invalida")
+        (total,) = struct.unpack_from('<I', datos, 4)
+        codigos, entradas = array('H'), array('H')
+        codigos.frombytes(datos[8:8 + 2 * total])
+        entradas.frombytes(datos[8 + 2 * total:8 + 4 * total])
+        if len(entradas) != total:
+            raise ValueError("archivo truncado")
+        if sys.byteorder != 'little':
+            codigos.byteswap()
+            entradas.byteswap()
+        return LibroAperturas(dict(zip(codigos, entradas)))
+    except (OSError, ValueError, struct.error):
+        libro = resolver()
+        try:
+            guardar(libro, ruta)
+        except OSError:
+            pass # sin permiso de escritura: se usa en memoria
+        return LibroAperturas(libro)
+
+
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ class LibroAperturas                                                         ║
+║ ──────────────────────────────────────────────────────────────────────────── ║
+║  Atributos:                                                                  ║
+║      entradas (dict[int,int]): codigo canonico -> entrada empaquetada.       ║
+║  Solo se lee despues de construido: se comparte entre sesiones sin locks.    ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+class LibroAperturas:
+
+    def __init__(self, entradas: dict):
+        self.entradas = entradas
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def _consultar(self, estado, ficha: str):
+        tablero = _normalizar(estado, ficha)
+        if '-' not in tablero or _gana(tablero, 'X') or _gana(tablero, 'O'):
+            return None
+        codigo, sim = canonica(tablero)
+        entrada = self.entradas.get(codigo)
+        if entrada is None:
+            return None # posicion ilegal (no alcanzable desde el tablero vacio)
+        return entrada, sim
+
+    def jugada(self, estado, ficha: str):
+        """Casilla optima de menor indice para `ficha`, la misma que elige minimax.
+        None si la partida termino o la posicion no esta en el libro."""
+        hallado = self._consultar(estado, ficha)
+        if hallado is None:
+            return None
+        entrada, sim = hallado
+        mascara = entrada & 0x1FF
+        return min(sim[i] for i in range(9) if mascara >> i & 1)
+
+    def puntaje(self, estado, ficha: str):
+        """Puntaje de la posicion para quien mueve (ver convenciones)."""
+        hallado = self._consultar(estado, ficha)
+        return None if hallado is None else (hallado[0] >> 9) - 16
+
+
+if __name__ == "__main__":
+    libro = resolver()
+    guardar(libro)
+    print(f" Libro guardado en {RUTA_LIBRO}: {len(libro)} posiciones canonicas, "
+          f"{RUTA_LIBRO.stat().st_size} bytes")
@@ -1,6 +1,9 @@
 # Autor: Laura Herrera — Fecha: 2025-10-14
 
-import os, sys, secrets, importlib.util, heapq, random, re
+import os, sys, secrets, importlib.util, heapq, random, re, hashlib, base64
+from collections import OrderedDict, deque
+from array import array
+from bisect import bisect_right
 from pathlib import Path
 from typing import Dict, Tuple, Any
 from flask import Flask, render_template, jsonify, request, session, send_from_directory
@@ -218,6 +221,15 @@ def _set_attr(obj, names, value):
     setattr(obj, names[0], value)
 
 # ---------------- Adaptador Minimax (TicTacToe) ----------------
+def _ttt_libro():
+    """Libro de aperturas compartido por todas las sesiones (solo lectura)."""
+    try:
+        return load_module_by_path(Path("algos/minimax-libro.py").resolve(), "mod_minimax_libro").cargar()
+    except Exception:
+        return None  # sin libro: JugadorComputadora vuelve a buscar con minimax
+
+_TTT_LIBRO = _ttt_libro()
+
 def _ttt_init(mod):
     g = mod.TicTacToe()
     try:
@@ -228,7 +240,37 @@ def _ttt_init(mod):
         _set_attr(g, ["jugadorBot","botPlayer"], "O")
     BotClass = getattr(mod, "JugadorComputadora", None) or getattr(mod, "ComputerPlayer", None)
     bot = BotClass(_pick_attr(g, "jugadorBot", "botPlayer"))
-    return {"g": g, "bot": bot, "fin": False}
+    if _TTT_LIBRO is not None and hasattr(bot, "libro"):
+        bot.libro = _TTT_LIBRO
+    return {"g": g, "bot": bot, "fin": False,
+            "mnk": None,  # tablero m,n,k distinto de 3,3,3: {"juego","buscador","tablero"}
+            "agente": "minimax",  # "minimax" (o alfa-beta en m,n,k) | "mcts"
+            "mcts": None, "ia_stats": None}
+
+_TTT_AGENTES = ("minimax", "mcts")
+
+def _ttt_mcts(state, mod, juego=None):
+    """JugadorMCTS de la sesión para el tablero actual (juego=None: triqui clásico)."""
+    botL = _pick_attr(state["g"], "jugadorBot", "botPlayer")
+    m = state.get("mcts")
+    if juego is None:
+        clasico = m is not None and (m.juego.m, m.juego.n, m.juego.k) == (3, 3, 3)
+        juego = m.juego if clasico else mod.JuegoMNK(3, 3, 3)
+    if m is None or m.juego is not juego or m.jugadorBot != botL:
+        m = mod.JugadorMCTS(botL, juego, playouts=50_000, tiempo=_TTT_PRESUPUESTO)
+        state["mcts"] = m
+    return m
+
+_TTT_PRESUPUESTO = 0.5   # segundos por jugada de la IA en tableros m,n,k
+_TTT_MNK_MAX = 15
+
+def _mnk_status(mnk):
+    juego, tablero = mnk["juego"], mnk["tablero"]
+    x, o = juego.a_bits(tablero)
+    if juego.gana(x): return "Gana X"
+    if juego.gana(o): return "Gana O"
+    if "-" not in tablero: return "Empate"
+    return f"Turno de {'X' if tablero.count('X') == tablero.count('O') else 'O'}"
 
 def _ttt_status(g):
     win = getattr(g, "jugador_gana", None) or getattr(g, "is_player_win", None)
@@ -243,6 +285,19 @@ def _ttt_status(g):
 
 def _ttt_view(state):
     g = state["g"]
+    mnk = state.get("mnk")
+    if mnk is not None:
+        juego, tablero = mnk["juego"], mnk["tablero"]
+        msg = _mnk_status(mnk)
+        x, o = juego.a_bits(tablero)
+        winline = juego.linea_ganadora(x if msg == "Gana X" else o) if msg.startswith("Gana") else []
+        return {
+            "board": tablero, "winline": winline, "msg": msg,
+            "humano": _pick_attr(g, "jugadorHumano","humanPLayer","humanPlayer"),
+            "ia": _pick_attr(g, "jugadorBot","botPlayer"),
+            "m": juego.m, "n": juego.n, "k": juego.k,
+            "agente": state.get("agente", "minimax"), "ia_stats": state.get("ia_stats"),
+        }
     board = _pick_attr(g, "tablero", "board")
     msg = _ttt_status(g)
     lines = [(0,1,2),(3,4,5),(6,7,8),(0,3,6),(1,4,7),(2,5,8),(0,4,8),(2,4,6)]
@@ -262,12 +317,37 @@ def _ttt_view(state):
         "winline": winline,
         "msg": msg,
         "humano": humano,
-        "ia": ia
+        "ia": ia,
+        "m": 3, "n": 3, "k": 3,
+        "agente": state.get("agente", "minimax"), "ia_stats": state.get("ia_stats"),
     }
 
-def _ttt_step(state, action: str):
+def _ttt_step(state, action: str, mod=None):
     g = state["g"]; bot = state["bot"]
     board = _pick_attr(g, "tablero", "board")
+    if action.startswith("agente:"):
+        # agente:minimax | agente:mcts (la IA que responde a la acción "ai")
+        nombre = action.split(":", 1)[1]
+        if nombre in _TTT_AGENTES and (nombre != "mcts" or hasattr(mod, "JugadorMCTS")):
+            state["agente"] = nombre
+        return state
+    if action.startswith("config:"):
+        # config:m,n,k (3,3,3 vuelve al triqui clásico con minimax/libro)
+        m, n, k = (int(v) for v in action.split(":", 1)[1].split(","))
+        m, n = max(3, min(_TTT_MNK_MAX, m)), max(3, min(_TTT_MNK_MAX, n))
+        k = max(3, min(max(m, n), k))
+        for i in range(9): board[i] = "-"
+        state["fin"] = False
+        state["ia_stats"] = None
+        if (m, n, k) == (3, 3, 3) or mod is None or not hasattr(mod, "JuegoMNK"):
+            state["mnk"] = None
+        else:
+            juego = mod.JuegoMNK(m, n, k)
+            state["mnk"] = {"juego": juego, "buscador": mod.BuscadorMNK(juego, _TTT_PRESUPUESTO),
+                            "tablero": ["-"] * (m * n)}
+        return state
+    if state.get("mnk") is not None:
+        return _mnk_step(state, action, mod)
     if action == "reset":
         for i in range(9): board[i] = "-"
         state["fin"] = False
@@ -280,8 +360,14 @@ def _ttt_step(state, action: str):
             if not _ttt_status(g).startswith("Turno"): state["fin"] = True
         return state
     if action == "ai" and not state["fin"]:
-        mv = getattr(bot, "movimiento_maquina", None) or getattr(bot, "machine_move", None)
-        pos = mv(board)
+        if state.get("agente") == "mcts":
+            mcts = _ttt_mcts(state, mod)
+            pos = mcts.movimiento_maquina(board)
+            state["ia_stats"] = mcts.estadisticas
+        else:
+            mv = getattr(bot, "movimiento_maquina", None) or getattr(bot, "machine_move", None)
+            pos = mv(board)
+            state["ia_stats"] = None
         if pos is not None and 0 <= pos < 9 and board[pos] == "-":
             botL = _pick_attr(g, "jugadorBot","botPlayer")
             board[pos] = botL
@@ -289,35 +375,196 @@ def _ttt_step(state, action: str):
         return state
     return state
 
-# --- A* mínimo (Manhattan, 4-dir) para generar frames como en el video ---
-def _to_rc(idx, n): return divmod(idx, n)
-def _to_idx(r, c, n): return r*n + c
-def _h(a, b, n):
-    ra, ca = _to_rc(a, n); rb, cb = _to_rc(b, n)
-    return abs(ra-rb)+abs(ca-cb)
+def _mnk_step(state, action: str, mod):
+    g, mnk = state["g"], state["mnk"]
+    juego, tablero = mnk["juego"], mnk["tablero"]
+    if action == "reset":
+        tablero[:] = ["-"] * juego.celdas
+        state["fin"] = False
+        return state
+    if action.startswith("move:") and not state["fin"]:
+        i = int(action.split(":")[1])
+        if 0 <= i < juego.celdas and tablero[i] == "-":
+            tablero[i] = _pick_attr(g, "jugadorHumano","humanPLayer","humanPlayer")
+            if not _mnk_status(mnk).startswith("Turno"): state["fin"] = True
+        return state
+    if action == "ai" and not state["fin"]:
+        botL = _pick_attr(g, "jugadorBot","botPlayer")
+        if state.get("agente") == "mcts":
+            mcts = _ttt_mcts(state, mod, juego)  # también acotado por _TTT_PRESUPUESTO
+            pos = mcts.movimiento_maquina(tablero)
+            state["ia_stats"] = mcts.estadisticas
+        else:
+            x, o = juego.a_bits(tablero)
+            pos = mnk["buscador"].mejor_jugada(x, o, botL == "X")  # acotado por _TTT_PRESUPUESTO
+            state["ia_stats"] = mnk["buscador"].estadisticas
+        if pos is not None and tablero[pos] == "-":
+            tablero[pos] = botL
+        if not _mnk_status(mnk).startswith("Turno"): state["fin"] = True
+        return state
+    return state
+
+# --- A* web: el motor vive en algos/a-algorithm.py (astar_grid); aquí se graban los frames ---
+# --- Línea de tiempo A*: deltas por frame + keyframes periódicos de la frontera ---
+# En lugar de copiar visitados/frontera/padre en cada pop (O(V²) en total) se guarda,
+# por frame, solo el nodo cerrado y sus g/f; los cambios de padre van en dos arrays
+# planos (pv -> pu) con un marcador de "nodo abierto por primera vez". Como los
+# cerrados y los padres son prefijos de esos arrays, cualquier frame se reconstruye
+# bajo demanda; la frontera se reconstruye desde el keyframe anterior más cercano.
+# Los keyframes se espacian al menos tanto como la frontera que guardan, así su
+# tamaño total queda acotado por el número de frames incluso en mapas enormes.
+_LT_CLAVE_CADA = 256
+
+def _lt_nueva(origen):
+    return {
+        "origen": origen,
+        "actual": array("i"),       # nodo cerrado en cada frame (-1 = frame inicial)
+        "g": array("d"), "f": array("d"),
+        "pa": array("i"),           # padre del nodo cerrado en cada frame (-1 = sin padre)
+        "ini": array("i"),          # nº de cambios de padre aplicados al llegar a cada frame
+        "pv": array("i"), "pu": array("i"),   # padre[pv[j]] = pu[j]
+        "abre": bytearray(),        # 1 si el cambio j abre pv[j] (entra a la frontera)
+        "claves": {},               # frame -> array("i") con la frontera ordenada
+        "kf": array("i"),           # frames con keyframe, en orden
+    }
 
-def _vecinos(i, n, libres):
-    r,c = _to_rc(i, n)
-    if r+1<n and libres[_to_idx(r+1,c,n)]==1: yield _to_idx(r+1,c,n)
-    if r-1>=0 and libres[_to_idx(r-1,c,n)]==1: yield _to_idx(r-1,c,n)
-    if c+1<n and libres[_to_idx(r,c+1,n)]==1: yield _to_idx(r,c+1,n)
-    if c-1>=0 and libres[_to_idx(r,c-1,n)]==1: yield _to_idx(r,c-1,n)
+def _lt_len(linea):
+    return len(linea["actual"]) if linea else 0
+
+def _lt_padre(linea, v, u, nuevo):
+    linea["pv"].append(v); linea["pu"].append(u)
+    linea["abre"].append(1 if nuevo else 0)
+
+def _lt_snap(linea, actual, g, f, open_set, padre=-1):
+    k = len(linea["actual"])
+    linea["actual"].append(-1 if actual is None else actual)
+    linea["pa"].append(padre)
+    linea["g"].append(float("nan") if g is None else g)
+    linea["f"].append(float("nan") if f is None else f)
+    linea["ini"].append(len(linea["pv"]))
+    kf = linea["kf"]
+    if not kf or k - kf[-1] >= max(_LT_CLAVE_CADA, len(open_set)):
+        kf.append(k)
+        linea["claves"][k] = array("i", sorted(open_set))
+
+def _lt_frontera(linea, idx):
+    kf = linea["kf"]
+    base = kf[bisect_right(kf, idx) - 1]
+    front = set(linea["claves"][base])
+    pv, abre = linea["pv"], linea["abre"]
+    for j in range(linea["ini"][base], linea["ini"][idx]):
+        if abre[j]: front.add(pv[j])
+    front.difference_update(linea["actual"][base+1:idx+1])
+    return sorted(front)
+
+def _lt_frame(linea, idx):
+    """Reconstruye el frame idx con el mismo formato que los antiguos snapshots."""
+    actual = linea["actual"][idx]
+    m = linea["ini"][idx]
+    padre = dict(zip(linea["pv"][:m], linea["pu"][:m]))
+    return {
+        "actual": None if actual < 0 else actual,
+        "visitados": sorted(linea["actual"][1:idx+1]),
+        "frontera": _lt_frontera(linea, idx),
+        "g_actual": None if actual < 0 else linea["g"][idx],
+        "f_actual": None if actual < 0 else linea["f"][idx],
+        "padre": list(padre.items()),
+    }
+
+def _lt_delta(linea, a, b):
+    """Cambios para pasar del frame a al frame b (en cualquier dirección)."""
+    lo, hi = min(a, b), max(a, b)
+    cerr = [u for u in linea["actual"][lo+1:hi+1] if u >= 0]
+    pv, abre = linea["pv"], linea["abre"]
+    abiertos = {pv[j] for j in range(linea["ini"][lo], linea["ini"][hi]) if abre[j]}
+    cset = set(cerr)
+    entran, salen = sorted(abiertos - cset), sorted(cset - abiertos)
+    actual = linea["actual"][b]
+    # padre (definitivo) de cada nodo cerrado en el tramo, para path_parcial en el cliente
+    padres = []
+    if b > a:
+        padres = [[u, p] for u, p in zip(linea["actual"][a+1:b+1], linea["pa"][a+1:b+1]) if p >= 0]
+    return {
+        "desde": a, "hasta": b,
+        "visitados_mas": cerr if b > a else [],
+        "visitados_menos": cerr if b < a else [],
+        "frontera_mas": entran if b > a else salen,
+        "frontera_menos": salen if b > a else entran,
+        "padres": padres,
+        "actual": None if actual < 0 else actual,
+        "g_actual": None if actual < 0 else linea["g"][b],
+        "f_actual": None if actual < 0 else linea["f"][b],
+    }
+
+def _lt_recortar(linea, k):
+    """Copia de la línea de tiempo hasta el frame k inclusive."""
+    m = linea["ini"][k]
+    return {
+        "origen": linea["origen"],
+        "actual": linea["actual"][:k+1], "pa": linea["pa"][:k+1],
+        "g": linea["g"][:k+1], "f": linea["f"][:k+1], "ini": linea["ini"][:k+1],
+        "pv": linea["pv"][:m], "pu": linea["pu"][:m], "abre": linea["abre"][:m],
+        "claves": {j: fr for j, fr in linea["claves"].items() if j <= k},
+        "kf": array("i", [j for j in linea["kf"] if j <= k]),
+    }
 
 def _astar_init(mod):
     n = 50
     return {
         "n": n,
-        "cells": [0]*(n*n),   # 0=libre, 1=pared
+        "cells": mod.GridBits(n),   # bitset de paredes (1=pared)
+        "ver": 0,                   # versión de la grilla: sube con cada edición
+        "ediciones": deque(maxlen=_ASTAR_LOG_MAX),  # (ver, valor, celdas) para clientes con versión reciente
+        "celdas_wire": None,        # (ver, formato, datos) ya codificados
         "origen": None,
         "meta": None,
-        "frames": [],
+        "linea": None,        # línea de tiempo compacta (ver _lt_nueva)
         "idx": 0,
         "path": [],
+        "opciones": dict(_ASTAR_OPC_DEF),
+        "opciones_nota": "",      # opciones pedidas que el motor no usa (ver _astar_normalizar)
+        "cache": OrderedDict(),   # (hash grilla, origen, meta, opciones) -> resultado de run
+        "base": OrderedDict(),    # misma clave con las opciones base -> expansiones del A* base
+        "lpa": None, "lpa_firma": None,
+        "cambios": set(),         # celdas editadas desde la última sincronización del LPA*
+        "comp": None,             # GridComponents: alcanzabilidad sin buscar (se crea al primer run)
         "msg": "Coloca paredes (izq/der arrastre). Shift=Origen, Alt=Meta, Espacio=Ejecutar, C=Limpiar."
     }
 
-def _astar_view(state):
-    fr = state["frames"][state["idx"]] if state.get("frames") else {}
+def _astar_celdas(state, ver_cliente=None):
+    """
+    Paredes en formato compacto para el cliente:
+      - nada si el cliente ya tiene la versión actual,
+      - cells_ops ([valor, [celdas]] por edición) si su versión sigue en el registro,
+      - cells_fmt="rle" (rachas alternas libre/pared) o "bits" (bitset en base64), el más chico.
+    """
+    ver = state["ver"]
+    out = {"ver": ver}
+    try:
+        vc = int(ver_cliente)
+    except (TypeError, ValueError):
+        vc = None
+    if vc == ver:
+        return out
+    log = state["ediciones"]
+    if vc is not None and vc < ver and log and log[0][0] <= vc + 1:
+        out["cells_ops"] = [[v, celdas] for (ve, v, celdas) in log if ve > vc]
+        return out
+    wire = state.get("celdas_wire")
+    if wire is None or wire[0] != ver:
+        cells = state["cells"]
+        # ~3 bytes JSON por racha frente a 4/3 bytes por cada 8 celdas en base64
+        runs = cells.rle(max_runs=len(cells) // 18)
+        if runs is not None:
+            wire = (ver, "rle", runs)
+        else:
+            wire = (ver, "bits", base64.b64encode(cells.bits).decode("ascii"))
+        state["celdas_wire"] = wire
+    out.update({"cells_fmt": wire[1], "cells_data": wire[2]})
+    return out
+
+def _astar_view(state, cliente=None):
+    fr = _lt_frame(state["linea"], state["idx"]) if state.get("linea") else {}
     parcial = []
     if fr.get("actual") is not None:
         padre = dict(fr.get("padre", []))
@@ -325,16 +572,15 @@ def _astar_view(state):
         while cur in padre:
             parcial.append(cur)
             cur = padre[cur]
-        if state["origen"] is not None:
-            parcial.append(state["origen"])
+        parcial.append(cur)  # raíz del árbol: el origen (o la meta en la búsqueda bidireccional)
         parcial = list(reversed(parcial))
 
     return {
-        "n": state["n"], "cells": state["cells"],
+        "n": state["n"], **_astar_celdas(state, (cliente or {}).get("ver")),
         "origen": state["origen"], "meta": state["meta"],
         "path": state.get("path", []),
         "msg": state.get("msg",""),
-        "frames_len": len(state.get("frames",[])),
+        "frames_len": _lt_len(state.get("linea")),
         "frame_idx": state.get("idx",0),
         "visitados": (fr.get("visitados", []) or []),
         "frontera":  (fr.get("frontera", []) or []),
@@ -343,6 +589,7 @@ def _astar_view(state):
         "f_actual":  fr.get("f_actual", None),
         "padre":     fr.get("padre", []),
         "path_parcial": parcial,
+        "opciones": state.get("opciones", _ASTAR_OPC_DEF),
     }
 
 def _astar_step(state, action: str, mod):
@@ -350,35 +597,77 @@ def _astar_step(state, action: str, mod):
 
     if action == "clear":
         n = state["n"]
-        state.update({"cells":[0]*(n*n),"frames":[],"idx":0,"path":[],"origen":None,"meta":None,"msg":"Limpio"})
+        state.update({"cells":mod.GridBits(n),"linea":None,"idx":0,"path":[],"origen":None,"meta":None,"msg":"Limpio"})
+        _astar_reemplazar(state)
         return state
 
-    if action == "run":
+    if action.startswith("set_n:"):
+        # set_n:<lado> entre 5 y _ASTAR_N_MAX; la grilla nueva empieza vacía
+        n = max(5, min(_ASTAR_N_MAX, int(action.split(":")[1])))
+        state.update({"n":n,"cells":mod.GridBits(n),"linea":None,"idx":0,"path":[],"origen":None,"meta":None,
+                      "msg":f"Grilla {n}x{n}"})
+        _astar_reemplazar(state)
+        state["cache"].clear()
+        return state
+
+    if action == "run" or action.startswith("run:"):
+        # run:alg=jps,mov=8,h=octile,w=1.5,tie=g  (las opciones quedan guardadas para el siguiente run)
+        if ":" in action:
+            state["opciones"], state["opciones_nota"] = _astar_normalizar(
+                _astar_opciones(action.split(":", 1)[1]))
         s, t = state["origen"], state["meta"]
         if s is None or t is None:
             state["msg"]="Debe fijar origen y meta (Shift/Alt + clic)."; return state
         if state["cells"][s]==1 or state["cells"][t]==1:
             state["msg"]="Origen/Meta no pueden ser pared."; return state
-        out = _astar_compute_frames(state["n"], state["cells"], s, t)
-        state["frames"] = out.get("frames", [])
+        if not _astar_componentes(state, mod).connected(s, t):
+            state.update({"linea": None, "idx": 0, "path": [],
+                          "msg": "Sin solución • origen y meta en componentes distintas"})
+            return state
+        opc = state.get("opciones", _ASTAR_OPC_DEF)
+        clave = _astar_clave(state, opc)
+        out = state["cache"].get(clave)
+        if out is not None:
+            state["cache"].move_to_end(clave)
+            msg = out["msg"] + " • caché"
+        else:
+            out = _astar_reusar_meta(state, clave, opc)
+            if out is None:
+                motor = _astar_motor(state, mod, opc)
+                out = _astar_compute_frames(state["n"], state["cells"], s, t, motor, opc)
+                out["msg"] = _astar_resumen(state, out, mod, opc)
+            else:
+                out["msg"] = f"Listo • meta ya explorada (caché) • coste={mod.path_cost(out['camino'], state['n']):.2f}"
+            _astar_cachear(state, clave, out)
+            msg = out["msg"]
+        if state.get("opciones_nota"):
+            msg += f" • {state['opciones_nota']}"
+        state["linea"] = out.get("linea")
         state["idx"] = 0
         state["path"] = out.get("camino", [])
-        state["msg"] = "Listo" if state["path"] else "Sin solución"
+        state["msg"] = msg
         return state
 
     if action == "next":
-        if state.get("frames"): state["idx"] = min(state["idx"]+1, len(state["frames"])-1)
+        if state.get("linea"): state["idx"] = min(state["idx"]+1, _lt_len(state["linea"])-1)
         return state
 
     if action == "prev":
-        if state.get("frames"): state["idx"] = max(state["idx"]-1, 0)
+        if state.get("linea"): state["idx"] = max(state["idx"]-1, 0)
+        return state
+
+    if action.startswith("goto:"):
+        if state.get("linea"):
+            state["idx"] = max(0, min(int(action.split(":")[1]), _lt_len(state["linea"])-1))
         return state
 
     if action.startswith("toggle:"):
         i = int(action.split(":")[1])
         if ok(i) and i not in (state.get("origen"), state.get("meta")):
-            state["cells"][i] = 0 if state["cells"][i]==1 else 1
-            state["frames"]=[]; state["path"]=[]; state["msg"]="Pared actualizada"
+            v = 0 if state["cells"][i]==1 else 1
+            _astar_editar(state, i, v)
+            _astar_registrar(state, v, [i])
+            state["linea"]=None; state["path"]=[]; state["msg"]="Pared actualizada"
         return state
 
     if action.startswith("paint:"):
@@ -386,8 +675,9 @@ def _astar_step(state, action: str, mod):
         _, idx, val = action.split(":")
         i, v = int(idx), int(val)
         if ok(i) and i not in (state.get("origen"), state.get("meta")) and v in (0,1):
-            state["cells"][i] = v
-            state["frames"]=[]; state["path"]=[]; state["msg"]="Pared actualizada"
+            if _astar_editar(state, i, v):
+                _astar_registrar(state, v, [i])
+            state["linea"]=None; state["path"]=[]; state["msg"]="Pared actualizada"
         return state
 
     if action.startswith("bulk:"):
@@ -395,92 +685,246 @@ def _astar_step(state, action: str, mod):
         _, v, csv = action.split(":")
         v = int(v)
         if v in (0,1):
+            hechas = []
             for tok in csv.split(","):
                 if not tok: continue
                 i = int(tok)
                 if ok(i) and i not in (state.get("origen"), state.get("meta")):
-                    state["cells"][i] = v
-            state["frames"]=[]; state["path"]=[]; state["msg"]="Pared actualizada (lote)"
+                    if _astar_editar(state, i, v): hechas.append(i)
+            if hechas: _astar_registrar(state, v, hechas)
+            state["linea"]=None; state["path"]=[]; state["msg"]="Pared actualizada (lote)"
         return state
 
     if action.startswith("set_origen:"):
         i = int(action.split(":")[1])
         if ok(i) and state["cells"][i]==0 and i != state.get("meta"):
-            state["origen"]=i; state["frames"]=[]; state["path"]=[]; state["msg"]="Origen cambiado"
+            state["origen"]=i; state["linea"]=None; state["path"]=[]; state["msg"]="Origen cambiado"
         return state
 
     if action.startswith("set_meta:"):
         i = int(action.split(":")[1])
         if ok(i) and state["cells"][i]==0 and i != state.get("origen"):
-            state["meta"]=i; state["frames"]=[]; state["path"]=[]; state["msg"]="Meta cambiada"
+            state["meta"]=i; state["linea"]=None; state["path"]=[]; state["msg"]="Meta cambiada"
         return state
 
     if action.startswith("random:"):
         # random:<p> con p in [0,1] (limitamos a 0.6)
         p = float(action.split(":")[1])
         p = max(0.0, min(0.6, p))
-        n = state["n"]; s, t = state.get("origen"), state.get("meta")
-        for i in range(n*n):
-            if i==s or i==t: continue
-            state["cells"][i] = 1 if random.random() < p else 0
-        state["frames"]=[]; state["path"]=[]; state["msg"] = f"Pared aleatoria {int(p*100)}%"
+        n = state["n"]
+        muro = np.random.random(n*n) < p
+        for i in (state.get("origen"), state.get("meta")):
+            if i is not None: muro[i] = False
+        state["cells"] = mod.GridBits(n, np.packbits(muro, bitorder="little").tobytes())
+        state["linea"]=None; state["path"]=[]; state["msg"] = f"Pared aleatoria {int(p*100)}%"
+        _astar_reemplazar(state)  # cambio masivo: el LPA* se rehace
         return state
 
     return state
 
-def _astar_compute_frames(n, cells, origen, meta):
-    libres = [1 if cells[k]==0 else 0 for k in range(n*n)]
+_ASTAR_LOTE_MAX = 200
+_ASTAR_CACHE_MAX = 8
+_ASTAR_CACHE_FRAMES = 2_000_000  # tope de frames sumados entre las líneas de la caché
+_ASTAR_BASE_MAX = 64  # expansiones del A* base recordadas (solo enteros)
+_ASTAR_BASE_SOLO_CACHE = {"lpa"}  # motores que no relanzan el A* base para el mensaje
+_ASTAR_BASE_CELDAS_MAX = 250_000  # grillas mayores (500x500) no lanzan el A* base solo para comparar
+_ASTAR_N_MAX = 2000
+_ASTAR_LOG_MAX = 64
+_ASTAR_OPC_DEF = {"alg": "astar", "mov": 4, "h": "", "w": 1.0, "tie": "fifo"}
+_ASTAR_MOTORES = {"astar": "astar_grid", "jps": "jps_grid", "bidir": "bidirectional_grid",
+                  "lpa": "LPAStar"}  # opción alg -> módulo
+
+def _astar_editar(state, i, v):
+    """Cambia la celda i y la anota para reparar luego el LPA* de la sesión. True si cambió."""
+    if state["cells"][i] != v:
+        state["cells"][i] = v
+        if state.get("lpa") is not None:
+            state["cambios"].add(i)
+        if state.get("comp") is not None:
+            state["comp"].set_cell(i, v)
+        return True
+    return False
+
+def _astar_registrar(state, v, celdas):
+    """Nueva versión de la grilla tras una edición puntual (los clientes la reciben como cells_ops)."""
+    state["ver"] += 1
+    state["ediciones"].append((state["ver"], v, celdas))
+
+def _astar_reemplazar(state):
+    """Nueva versión tras reemplazar la grilla entera: el registro ya no sirve, el LPA* se
+    rehace y las componentes se vuelven a etiquetar bajo demanda."""
+    state["ver"] += 1
+    state["ediciones"].clear()
+    state.update({"lpa": None, "cambios": set(), "comp": None})
+
+def _astar_componentes(state, mod):
+    if state.get("comp") is None:
+        state["comp"] = mod.GridComponents(state["n"], state["cells"].unpack())
+    return state["comp"]
+
+def _astar_clave(state, opc):
+    h = hashlib.blake2b(state["cells"].bits, digest_size=16).digest()
+    return (state["n"], h, state["origen"], state["meta"], tuple(sorted(opc.items())))
+
+def _astar_cachear(state, clave, out):
+    """LRU acotada en entradas y en frames totales (las líneas de mapas grandes pesan)."""
+    cache = state["cache"]
+    cache[clave] = out
+    while len(cache) > 1 and (len(cache) > _ASTAR_CACHE_MAX or
+                              sum(_lt_len(o.get("linea")) for o in cache.values()) > _ASTAR_CACHE_FRAMES):
+        cache.popitem(last=False)
+
+def _astar_consistente(opc):
+    """Heurística consistente para el movimiento elegido (Manhattan sobrestima en 8-conexo)."""
+    return opc["w"] == 1.0 and not (opc["mov"] == 8 and opc["h"] == "manhattan")
+
+def _astar_reusar_meta(state, clave, opc):
+    """
+    Si solo se movió la meta: una búsqueda A* cacheada desde el mismo origen que ya
+    cerró la nueva meta tiene su camino óptimo (heurística consistente), así que se
+    recorta su línea de tiempo hasta ese frame en lugar de buscar otra vez.
+    """
+    if opc["alg"] != "astar" or not _astar_consistente(opc):
+        return None
+    n, h, s, t, okey = clave
+    for (n2, h2, s2, _, okey2), out in reversed(state["cache"].items()):
+        linea = out.get("linea")
+        if (n2, h2, s2, okey2) != (n, h, s, okey) or not linea:
+            continue
+        try:
+            k = linea["actual"].index(t)
+        except ValueError:
+            continue
+        padre = dict(zip(linea["actual"][:k+1], linea["pa"][:k+1]))
+        camino = [t]
+        while padre.get(camino[-1], -1) != -1:
+            camino.append(padre[camino[-1]])
+        camino.reverse()
+        return {"linea": _lt_recortar(linea, k), "camino": camino, "expandidos": 0}
+    return None
+
+def _astar_motor(state, mod, opc):
+    """Función con la firma de astar_grid para la opción alg (lpa reutiliza el planificador)."""
+    if opc["alg"] != "lpa":
+        return getattr(mod, _ASTAR_MOTORES[opc["alg"]])
+    n, s, t = state["n"], state["origen"], state["meta"]
+    h = opc["h"]  # ya normalizada: consistente para el movimiento
+    firma = (s, t, opc["mov"], h)
+    p = state.get("lpa")
+    if p is None or state.get("lpa_firma") != firma or len(state["cambios"]) > max(16, n*n // 20):
+        p = mod.LPAStar(n, state["cells"].unpack(), s, t, connectivity=opc["mov"], heuristic=h or None)
+        state.update({"lpa": p, "lpa_firma": firma})
+    else:
+        p.update_cells(state["cambios"], state["cells"])
+    state["cambios"] = set()
+    return lambda n, walls, s, t, on_close, on_parent, **_: p.compute(on_close, on_parent)
+
+def _astar_opciones(txt: str) -> dict:
+    """Parsea 'alg=jps,mov=8,h=octile,w=1.5,tie=g' sobre los valores por defecto."""
+    opc = dict(_ASTAR_OPC_DEF)
+    for tok in txt.split(","):
+        k, _, v = tok.partition("=")
+        k, v = k.strip(), v.strip()
+        if k == "alg" and v in _ASTAR_MOTORES: opc["alg"] = v
+        elif k == "mov" and v in ("4", "8"): opc["mov"] = int(v)
+        elif k == "h" and v in ("", "manhattan", "octile", "euclidean", "chebyshev", "zero"): opc["h"] = v
+        elif k == "w": opc["w"] = max(1.0, min(5.0, float(v)))
+        elif k == "tie" and v in ("fifo", "g"): opc["tie"] = v
+    return opc
+
+def _astar_normalizar(opc: dict) -> tuple:
+    """
+    LPA* repara un A* puro con heurística consistente: fija w=1, tie=fifo y la heurística
+    que de verdad usa, así la clave de caché y el mensaje no muestran otra configuración.
+    Retorna (opciones, nota con lo que se cambió o "").
+    """
+    if opc["alg"] != "lpa":
+        return opc, ""
+    real = dict(opc, w=1.0, tie="fifo")
+    if not _astar_consistente(real):
+        real["h"] = ""
+    cambios = [f"{k}={real[k] or 'por defecto'}" for k in ("w", "tie", "h") if real[k] != opc[k]]
+    return real, ("LPA* usa " + ", ".join(cambios)) if cambios else ""
+
+def _astar_kwargs(opc: dict) -> dict:
+    return {"connectivity": opc["mov"], "heuristic": opc["h"] or None,
+            "weight": opc["w"], "tie": opc["tie"]}
+
+def _astar_resumen(state, out, mod, opc):
+    """Mensaje tras run: expansiones, coste y ahorro frente a A* base con el mismo movimiento.
+    Las expansiones del A* base (astar_grid sin callbacks) se calculan una vez por (grilla,
+    origen, meta, movimiento) y se recuerdan en state["base"]; en grillas de más de
+    _ASTAR_BASE_CELDAS_MAX celdas el mensaje dice que la comparación se omitió. Los motores
+    de _ASTAR_BASE_SOLO_CACHE solo la muestran si ya se conoce."""
+    if not out.get("camino"):
+        return "Sin solución"
+    n, camino, exp = state["n"], out["camino"], out["expandidos"]
+    msg = f"Listo • expandidos={exp} • coste={mod.path_cost(camino, n):.2f}"
+    base_opc = dict(_ASTAR_OPC_DEF, mov=opc["mov"])
+    clave = _astar_clave(state, base_opc)
+    bases = state["base"]
+    if opc == base_opc:
+        base = exp
+    elif clave in bases:
+        base = bases[clave]
+    elif opc["alg"] in _ASTAR_BASE_SOLO_CACHE:
+        return msg  # relanzar el A* completo anularía lo que ahorra el motor
+    elif n * n > _ASTAR_BASE_CELDAS_MAX:
+        return msg + f" • base omitida (grilla {n}x{n})"
+    else:
+        _, base = mod.astar_grid(n, state["cells"].unpack(), state["origen"], state["meta"],
+                                 **_astar_kwargs(base_opc))
+    bases[clave] = base
+    bases.move_to_end(clave)
+    while len(bases) > _ASTAR_BASE_MAX:
+        bases.popitem(last=False)
+    if base and opc != base_opc:
+        msg += f" • base={base} ({round(100*(base-exp)/base)}% ahorro)"
+    return msg
+
+def _astar_delta(state, action: str, mod, data):
+    """
+    Modo incremental para autoplay: aplica next/prev/goto hasta `lote` veces y
+    devuelve solo los cambios de frame respecto a `desde` (el frame que ya tiene
+    el cliente). None si la acción cambia la grilla y requiere la vista completa.
+    """
+    linea = state.get("linea")
+    if not linea or not (action in ("next", "prev") or action.startswith("goto:")):
+        return None
+    desde = data.get("desde")
+    desde = state["idx"] if desde is None else int(desde)
+    if not 0 <= desde < _lt_len(linea):
+        return None
+    lote = max(1, min(int(data.get("lote") or 1), _ASTAR_LOTE_MAX))
+    state["idx"] = desde  # el cliente manda: pudo pedir lotes por adelantado
+    deltas = []
+    for _ in range(lote):
+        _astar_step(state, action, mod)
+        deltas.append(_lt_delta(linea, desde, state["idx"]))
+        if state["idx"] == desde: break
+        desde = state["idx"]
+    return {"deltas": deltas, "frames_len": _lt_len(linea)}
+
+def _astar_compute_frames(n, cells, origen, meta, motor, opc=_ASTAR_OPC_DEF):
     s, t = origen, meta
-    if libres[s]!=1 or libres[t]!=1:
-        return {"frames": [], "camino": []}
-
-    g = {s: 0.0}
-    f = {s: float(_h(s,t,n))}
-    came = {}
-    visit = set()
-    open_set = {s}
-    heap = [(f[s], 0, s)]
-    tie = 0
-    frames = []
-
-    def snap(actual):
-        frames.append({
-            "actual": actual,
-            "visitados": sorted(list(visit)),
-            "frontera": [x for (_,__,x) in heap if x in open_set],
-            "g_actual": None if actual is None else g.get(actual),
-            "f_actual": None if actual is None else f.get(actual),
-            "padre": list(came.items())
-        })
-
-    snap(None)
-    while heap:
-        _, __, u = heapq.heappop(heap)
-        if u not in open_set: continue
-        open_set.remove(u)
-        visit.add(u)
-        snap(u)
-
-        if u == meta:
-            path=[meta]
-            while path[-1] in came:
-                path.append(came[path[-1]])
-                if path[-1]==s: break
-            path.reverse()
-            return {"frames": frames, "camino": path}
-
-        for v in _vecinos(u, n, libres):
-            cand = g[u] + 1.0
-            if cand < g.get(v, float("inf")):
-                came[v] = u
-                g[v] = cand
-                f[v] = cand + _h(v, meta, n)
-                if v not in open_set and v not in visit:
-                    tie += 1
-                    heapq.heappush(heap, (f[v], tie, v))
-                    open_set.add(v)
-
-    return {"frames": frames, "camino": []}
+    if cells[s]!=0 or cells[t]!=0:
+        return {"linea": None, "camino": [], "expandidos": 0}
+
+    linea = _lt_nueva(s)
+    abiertos = {s}  # solo para los keyframes de la frontera
+
+    def al_cerrar(u, g, f, padre):
+        abiertos.discard(u)
+        _lt_snap(linea, u, g, f, abiertos, padre)
+
+    def al_padre(v, u, nuevo):
+        _lt_padre(linea, v, u, nuevo)
+        if nuevo: abiertos.add(v)
+
+    _lt_snap(linea, None, None, None, abiertos)
+    walls = cells.unpack() if hasattr(cells, "unpack") else bytearray(cells)
+    camino, exp = motor(n, walls, s, t, al_cerrar, al_padre, **_astar_kwargs(opc))
+    return {"linea": linea, "camino": camino, "expandidos": exp}
 
 # ---------------- Adaptador Wumpus (probabilístico) ----------------
 def _wumpus_init(mod):
@@ -550,15 +994,35 @@ def _wumpus_step(state, action: str, mod):
     return state
 
 # ---------------- Adaptador Markov (n-gramas) ----------------
+_MARKOV_MODELOS_MAX = 4   # modelos (uno por orden) que se guardan por sesión
+
+def _markov_modelo(state, mod, orden):
+    """
+    Modelo de `orden` al día con state["corpus"]. Reusa el de la caché por orden:
+    si el corpus no cambió lo devuelve tal cual, si solo creció al final lo
+    actualiza con el texto nuevo y si cambió de otra forma lo reentrena.
+    """
+    corpus = state["corpus"]
+    modelos = state["modelos"]
+    previo = modelos.pop(orden, None)
+    if previo is not None and corpus.startswith(previo[1]):
+        m = previo[0]
+        if len(corpus) > len(previo[1]):
+            m.actualizar(corpus[len(previo[1]):])
+    else:
+        m = getattr(mod, "CadenaMarkov")(orden)
+        m.entrenar(corpus)
+    modelos[orden] = (m, corpus)
+    while len(modelos) > _MARKOV_MODELOS_MAX:
+        modelos.popitem(last=False)
+    return m
+
 def _markov_init(mod):
     # estado inicial
     orden = 2
     corpus = getattr(mod, "ai_corpus", "")
-    Modelo = getattr(mod, "CadenaMarkov")
-    m = Modelo(orden)
-    m.entrenar(corpus)
     st = {
-        "modelo": m,
+        "modelos": OrderedDict(),   # orden -> (modelo, corpus con que quedó entrenado)
         "orden": orden,
         "corpus": corpus,
         "generado": [],
@@ -568,6 +1032,7 @@ def _markov_init(mod):
         "seed": None,
         "msg": "",
     }
+    st["modelo"] = _markov_modelo(st, mod, orden)
     return st
 
 def _markov_view(state):
@@ -585,9 +1050,9 @@ def _markov_view(state):
         "generado": state["generado"],
         "estado_actual": list(est),
         "distribucion": filas,  # [ [palabra, prob, conteo] ]
-        "vocab": len({w for c in m.transiciones.values() for w in c.keys()}),
+        "vocab": m.n_vocab(),
         "estados": len(m.estados),
-        "transiciones": sum(sum(c.values()) for c in m.transiciones.values()),
+        "transiciones": m.n_transiciones(),
         "topn": state.get("topn", 12),
         "autospeed": state.get("autospeed", 200),
     }
@@ -600,10 +1065,7 @@ def _markov_step(state, action: str, mod):
     if action.startswith("set_order:"):
         k = max(1, int(action.split(":")[1]))
         state["orden"] = k
-        Modelo = getattr(mod, "CadenaMarkov")
-        m2 = Modelo(k)
-        m2.entrenar(state["corpus"])
-        state["modelo"] = m2
+        state["modelo"] = _markov_modelo(state, mod, k)
         state["estado"] = tuple(["<START>"]*k)
         state["generado"] = []
         return state
@@ -615,10 +1077,7 @@ def _markov_step(state, action: str, mod):
         return state
 
     if action == "train":
-        Modelo = getattr(mod, "CadenaMarkov")
-        m = Modelo(state["orden"])
-        m.entrenar(state["corpus"])
-        state["modelo"] = m
+        state["modelo"] = _markov_modelo(state, mod, state["orden"])
         state["estado"] = tuple(["<START>"]*state["orden"])
         state["generado"] = []
         return state
@@ -673,36 +1132,85 @@ def _markov_step(state, action: str, mod):
     return state
 
 # ─────────────── Adaptador K-NN (clasificación clásico) ───────────────
+_KNN_FRONTERA_MAX = 256   # resolución máxima del mapa de decisión (lado en celdas)
+
 def _knn_init(mod):
     modelo = mod.KNNModelo(k=3)
     return {
         "modelo": modelo,
         "ultima_pred": None,           # {"x":..,"y":..,"label":..,"vecinos":[(i,dist),...]}
+        "frontera": None,              # {"res","clases","bytes","raster"} o None si está desactualizada
+        "ver_base": 0,                 # versión al último clear; ver = ver_base + #puntos
         "mostrar_vecinos": True,
         "colores": { "A": "#22c55e", "B": "#ef4444", "C": "#f59e0b", "D": "#3b82f6" }
     }
 
-def _knn_view(state):
+def _knn_puntos(state, ver_cliente=None):
+    """
+    Puntos para el cliente según la versión que ya tiene:
+      - nada si ya tiene la versión actual,
+      - solo los agregados desde su versión (puntos_col con desde > 0) si es del mismo clear,
+      - todos (desde = 0) en otro caso.
+    Los puntos solo se agregan al final, así la versión alcanza para saber qué falta.
+    """
+    m = state["modelo"]
+    base = state["ver_base"]
+    ver = base + len(m.xs)
+    out = {"ver": ver}
+    try:
+        vc = int(ver_cliente)
+    except (TypeError, ValueError):
+        vc = None
+    if vc == ver:
+        return out
+    desde = vc - base if vc is not None and base <= vc < ver else 0
+    out["puntos_col"] = m.exportar(desde)   # columnas x, y, c en base64 (ver KNNModelo.exportar)
+    return out
+
+def _knn_view(state, cliente=None):
     m = state["modelo"]
     up = state["ultima_pred"] or {}
     return {
         "k": m.k,
-        "puntos": m.puntos,            # [[x,y,clase], ...]
+        **_knn_puntos(state, (cliente or {}).get("ver")),
+        "n": len(m.xs),
         "clases": sorted(list(m.clases)) or ["A","B"],
         "mostrar_vecinos": state["mostrar_vecinos"],
         "ultima": up,                  # {"x","y","label","vecinos":[[idx,dist],...]}
+        "frontera": state["frontera"],
         "colores": state.get("colores", {})
     }
 
+def _knn_frontera(m, res: int):
+    """Clasifica el centro de cada celda de una grilla res x res (fila 0 arriba).
+    raster: códigos de clase (1 o 2 bytes por celda, little endian) en base64."""
+    xs = [(i + 0.5) / res for i in range(res)] * res
+    ys = [1 - (j + 0.5) / res for j in range(res) for _ in range(res)]
+    clases, codigos = m.predecir_lote(xs, ys)
+    if not clases:
+        return None
+    if sys.byteorder != "little":
+        codigos.byteswap()
+    return {"res": res, "clases": clases, "bytes": codigos.itemsize,
+            "raster": base64.b64encode(codigos.tobytes()).decode("ascii")}
+
 def _knn_step(state, action: str, mod):
     m = state["modelo"]
     if action == "clear":
+        state["ver_base"] += len(m.xs) + 1   # versión nueva aunque ya estuviera vacío
         m.limpiar()
         state["ultima_pred"] = None
+        state["frontera"] = None
         return state
     if action.startswith("set_k:"):
         k = int(action.split(":")[1])
         m.set_k(k)
+        state["frontera"] = None
+        return state
+    if action.startswith("boundary:"):
+        # boundary:<res>  mapa de decisión completo en una sola llamada
+        res = max(2, min(_KNN_FRONTERA_MAX, int(action.split(":")[1])))
+        state["frontera"] = _knn_frontera(m, res)
         return state
     if action.startswith("toggle_neighbors"):
         state["mostrar_vecinos"] = not state["mostrar_vecinos"]
@@ -712,11 +1220,13 @@ def _knn_step(state, action: str, mod):
         _, payload = action.split(":", 1)
         xs, ys, clase = payload.split(",", 2)
         m.agregar(float(xs), float(ys), clase.strip())
+        state["frontera"] = None
         return state
     if action.startswith("random:"):
         n = int(action.split(":")[1])
         clases = sorted(list(m.clases)) or ["A", "B"]
         m.aleatorios(n, clases=tuple(clases))
+        state["frontera"] = None
         return state
     if action.startswith("predict:"):
         # predict:x,y
@@ -820,25 +1330,33 @@ def init_for(algo_name: str):
         return ("static", mod, {}, "K-NN Regresión (k-vecinos más cercanos)")
     return ("static", mod, {}, f"{name}")
 
-def view_for(algo_name: str, mod, state):
+def view_for(algo_name: str, mod, state, cliente=None):
+    # cliente: datos que manda el navegador (p. ej. la versión de grilla que ya tiene)
     name = Path(algo_name).name
     if name == "minimax-algorithm.py": return _ttt_view(state)
-    if name == "a-algorithm.py": return _astar_view(state)
+    if name == "a-algorithm.py": return _astar_view(state, cliente)
     if name == "wumpus-algorithm.py": return _wumpus_view(state)
     if name == "markov-algorithm.py": return _markov_view(state)
-    if name == "knn-algorithm.py": return _knn_view(state)
+    if name == "knn-algorithm.py": return _knn_view(state, cliente)
     if name == "knn-regression.py": return {}
     return {}
 
 def step_for(algo_name: str, mod, state, action):
     name = Path(algo_name).name
-    if name == "minimax-algorithm.py": return _ttt_step(state, action)
+    if name == "minimax-algorithm.py": return _ttt_step(state, action, mod)
     if name == "a-algorithm.py": return _astar_step(state, action, mod)
     if name == "wumpus-algorithm.py": return _wumpus_step(state, action, mod)
     if name == "markov-algorithm.py": return _markov_step(state, action, mod)
+    if name == "knn-algorithm.py": return _knn_step(state, action, mod)
     if name == "knn-regression.py": return state
     return state
 
+def delta_for(algo_name: str, mod, state, action, data):
+    """Respuesta incremental (modo "delta") o None si el adaptador no la soporta."""
+    name = Path(algo_name).name
+    if name == "a-algorithm.py": return _astar_delta(state, action, mod, data)
+    return None
+
 # ---------------- Portada desde docs/ ----------------
 @app.route("/")
 def root_index():
@@ -960,7 +1478,7 @@ def api_state(name: str):
         ui, mod, st, label = init_for(name)
         _STORE[key] = (ui, mod, st, label)
     ui, mod, st, label = _STORE[key]
-    return jsonify({"ui": ui, "estado": view_for(name, mod, st), "label": label, "file": name})
+    return jsonify({"ui": ui, "estado": view_for(name, mod, st, request.args), "label": label, "file": name})
 
 @app.post("/api/<name>/act")
 def api_act(name: str):
@@ -968,9 +1486,14 @@ def api_act(name: str):
     action = (data.get("action") or "").strip()
     sid = _sid(); key = (sid, name)
     ui, mod, st, label = _STORE[key]
+    if data.get("modo") == "delta":
+        # {"action":"next","modo":"delta","desde":<idx del cliente>,"lote":N}
+        d = delta_for(name, mod, st, action, data)
+        if d is not None:
+            return jsonify({"ok": True, **d})
     st2 = step_for(name, mod, st, action)
     _STORE[key] = (ui, mod, st2, label)
-    return jsonify({"ok": True, "estado": view_for(name, mod, st2)})
+    return jsonify({"ok": True, "estado": view_for(name, mod, st2, data)})
 
 @app.post("/api/<name>/restart")
 def api_restart(name: str):